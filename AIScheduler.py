@@ -0,0 +1,168 @@
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Запас к радиусу обнаружения, на котором враг просыпается: покрывает ход игрока между проверками
+# спящих врагов и дальность огня магии
+LOD_WAKE_MARGIN = TILESIZE * 3
+# Спящие враги проверяются раз в LOD_INTERVAL кадров
+LOD_INTERVAL = 8
+LOD_TIERS = ('active', 'visible', 'sleeping')
+
+
+class AIScheduler:
+    """
+    Планировщик уровня детализации для ИИ и анимации врагов.
+
+    Враги делятся на уровни по расстоянию до игрока:
+        active - ближе радиуса пробуждения (notice_radius + LOD_WAKE_MARGIN) или заняты (атака, движение,
+            перезарядка, неуязвимость): полный update и расчет решений каждый кадр;
+        visible - дальше радиуса пробуждения, но на экране: только update (анимация), решения не считаются,
+            потому что статус все равно остался бы 'idle';
+        sleeping - дальше радиуса пробуждения и за экраном: не обновляются совсем и проверяются
+            раз в LOD_INTERVAL кадров.
+
+    У спящего врага update меняет только кадр анимации покоя, поэтому при пробуждении кадр досчитывается
+    за все пропущенные кадры, и игра идет так же, как при обновлении всех врагов. Работа за кадр растет
+    с количеством неспящих врагов, а не всех врагов карты.
+
+    Attributes:
+        order (dict): Порядковые номера спрайтов в камере (решения считаются в порядке группы).
+        awake (dict): Неспящие враги (используется как упорядоченное множество).
+        sleeping (dict): Спящий враг -> кадр, в котором он уснул.
+        buckets (list): Спящие враги по кадру проверки (номер кадра % LOD_INTERVAL).
+        frame (int): Номер текущего кадра планировщика.
+        counts (dict): Количество врагов на каждом уровне в последнем кадре.
+
+    Methods:
+        add(enemy): Добавляет врага (неспящим).
+        remove(enemy): Удаляет врага.
+        is_sleeping(enemy): Проверяет, пропускается ли update врага.
+        schedule(player): Распределяет врагов по уровням и возвращает тех, для кого нужно считать решения.
+    """
+    def __init__(self, order):
+        self.order = order
+        self.awake = {}
+        self.sleeping = {}
+        self.buckets = [{} for _ in range(LOD_INTERVAL)]
+        self.frame = 0
+        self.counts = dict.fromkeys(LOD_TIERS, 0)
+        self.animation_periods = {}
+
+    def add(self, enemy):
+        self.awake[enemy] = None
+
+    def remove(self, enemy):
+        self.awake.pop(enemy, None)
+        asleep = self.sleeping.pop(enemy, None)
+        if asleep is not None:
+            del self.buckets[asleep % LOD_INTERVAL][enemy]
+
+    def is_sleeping(self, enemy):
+        return enemy in self.sleeping
+
+    @staticmethod
+    def tier(enemy, player_x, player_y):
+        """
+        Определяет уровень врага относительно позиции игрока.
+
+        Parameters:
+            enemy (Enemy): Враг.
+            player_x (int): Центр игрока по x.
+            player_y (int): Центр игрока по y.
+
+        Returns:
+            str: 'active', 'visible' или 'sleeping'.
+        """
+        direction = enemy.direction
+        if (direction is None or direction.x or direction.y or enemy.status != 'idle' or not enemy.can_attack
+                or not enemy.vulnerable):
+            return 'active'
+
+        dx = player_x - enemy.rect.centerx
+        dy = player_y - enemy.rect.centery
+        wake_distance = enemy.notice_radius + LOD_WAKE_MARGIN
+        if dx * dx + dy * dy <= wake_distance * wake_distance:
+            return 'active'
+        if abs(dx) <= WIDTH // 2 + LOD_WAKE_MARGIN and abs(dy) <= HEIGHT // 2 + LOD_WAKE_MARGIN:
+            return 'visible'
+        return 'sleeping'
+
+    def catch_up(self, enemy, frames):
+        """
+        Досчитывает анимацию покоя за кадры, пропущенные во сне, так же как это сделал бы Enemy.animate.
+
+        Parameters:
+            enemy (Enemy): Просыпающийся враг.
+            frames (int): Количество пропущенных вызовов update.
+        """
+        animation = enemy.animations[enemy.status]
+        if not animation or not frames:
+            return
+
+        speed = enemy.animation_speed
+        frame_index = enemy.frame_index
+        # Досчет до сброса на первый кадр, дальше анимация повторяется с периодом period
+        while frames:
+            frames -= 1
+            frame_index += speed
+            if frame_index >= len(animation):
+                frame_index = 0
+                break
+
+        key = (speed, len(animation))
+        if key not in self.animation_periods:
+            period, value = 0, 0
+            while True:
+                period += 1
+                value += speed
+                if value >= len(animation):
+                    break
+            self.animation_periods[key] = period
+        for _ in range(frames % self.animation_periods[key]):
+            frame_index += speed
+            if frame_index >= len(animation):
+                frame_index = 0
+
+        enemy.frame_index = frame_index
+        enemy.image = animation[int(frame_index)]
+        enemy.rect = enemy.image.get_rect(center=enemy.hitbox.center)
+
+    def schedule(self, player):
+        """
+        Распределяет врагов по уровням: будит спящих, чья проверка выпала на этот кадр, и усыпляет далеких.
+
+        Parameters:
+            player (Player): Объект игрока.
+
+        Returns:
+            list: Враги уровня active в порядке группы, для которых нужно посчитать решения.
+        """
+        self.frame += 1
+        player_x, player_y = player.rect.center
+
+        bucket = self.buckets[self.frame % LOD_INTERVAL]
+        for enemy in list(bucket):
+            if self.tier(enemy, player_x, player_y) != 'sleeping':
+                del bucket[enemy]
+                self.catch_up(enemy, self.frame - self.sleeping.pop(enemy))
+                self.awake[enemy] = None
+
+        active = []
+        visible = 0
+        for enemy in list(self.awake):
+            tier = self.tier(enemy, player_x, player_y)
+            if tier == 'active':
+                active.append(enemy)
+            elif tier == 'visible':
+                visible += 1
+            else:
+                del self.awake[enemy]
+                self.sleeping[enemy] = self.frame
+                bucket[enemy] = None
+
+        self.counts = {'active': len(active), 'visible': visible, 'sleeping': len(self.sleeping)}
+        active.sort(key=self.order.get)
+        return active
@@ -1,63 +1,63 @@
 import os
-import pygame
 from random import choice
 
 
+# Папки с кадрами частиц
+particle_folders = {
+    'flame': 'graphics/particles/flame/frames',
+    'aura': 'graphics/particles/aura',
+    'heal': 'graphics/particles/heal/frames',
+
+    'claw': 'graphics/particles/claw',
+    'slash': 'graphics/particles/slash',
+    'sparkle': 'graphics/particles/sparkle',
+    'left_attack': 'graphics/particles/leaf_attack',
+    'thunder': 'graphics/particles/thunder',
+
+    'squid': 'graphics/particles/smoke_orange',
+    'raccoon': 'graphics/particles/raccoon',
+}
+
+# Папки с кадрами листьев (используются как есть и в зеркальном виде)
+leaf_folders = [
+    'graphics/particles/leaf1',
+    'graphics/particles/leaf2',
+    'graphics/particles/leaf3',
+    'graphics/particles/leaf4',
+    'graphics/particles/leaf5',
+    'graphics/particles/leaf6',
+]
+
+
 class AnimationPlayer:
-    def __init__(self):
+    def __init__(self, particles=None):
         """
         Конструктор класса AnimationPlayer.
 
         Инициализирует словарь frames, содержащий наборы изображений для различных анимаций.
+
+        Параметры:
+        particles (ParticleSystem): Пул частиц камеры. Если не задан, каждая частица создается
+        отдельным спрайтом ParticleEffect.
         """
-        self.frames = {
-            'flame': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/flame/frames'),
-            'aura': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/aura'),
-            'heal': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/heal/frames'),
-
-            'claw': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/claw'),
-            'slash': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/slash'),
-            'sparkle': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/sparkle'),
-            'left_attack': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf_attack'),
-            'thunder': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/thunder'),
-
-            'squid': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/smoke_orange'),
-            'raccoon': self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/raccoon'),
-
-            'leaf': (
-                self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf1'),
-                self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf2'),
-                self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf3'),
-                self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf4'),
-                self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf5'),
-                self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf6'),
-                self.reflect_images(self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf1')),
-                self.reflect_images(self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf2')),
-                self.reflect_images(self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf3')),
-                self.reflect_images(self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf4')),
-                self.reflect_images(self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf5')),
-                self.reflect_images(self.import_folder('C:/Users/Жена/PycharmProjects/game/graphics/particles/leaf6')),
-            )
-        }
+        self.particles = particles
+        self.frames = {name: self.import_folder(folder_path) for name, folder_path in particle_folders.items()}
+        self.frames['leaf'] = (
+            tuple(self.import_folder(folder_path) for folder_path in leaf_folders) +
+            tuple(self.import_reflected_folder(folder_path) for folder_path in leaf_folders)
+        )
 
     @staticmethod
-    def reflect_images(frames):
+    def asset_paths():
         """
-        Создает зеркальные копии изображений в переданном списке frames.
-
-        Параметры:
-        frames (list): Список изображений, для которых требуется создать зеркальные копии.
+        Возвращает пути ко всем кадрам частиц.
 
         Возвращает:
-        list: Список зеркальных копий изображений.
+        list: Пути к файлам изображений (для фоновой предзагрузки).
         """
-        new_frames = []
-
-        if frames is not None:
-            for frame in frames:
-                flipped_frame = pygame.transform.flip(frame, True, False)
-                new_frames.append(flipped_frame)
-        return new_frames
+        folders = list(particle_folders.values()) + leaf_folders
+        return [os.path.join(folder_path, file_name)
+                for folder_path in folders for file_name in os.listdir(folder_path)]
 
     def create_grass_particles(self, pos, groups):
         """
@@ -65,10 +65,10 @@ class AnimationPlayer:
 
         Параметры:
         pos (tuple): Кортеж с координатами (x, y) для размещения эффекта частиц.
-        groups (list): Группы спрайтов, в которые добавляется объект ParticleEffect.
+        groups (list): Группы спрайтов, в которые добавляется частица.
         """
         animation_frames = choice(self.frames['leaf'])
-        ParticleEffect(pos, animation_frames, groups)
+        self.spawn(pos, animation_frames, groups)
 
     def create_particles(self, animation_type, pos, groups):
         """
@@ -77,10 +77,25 @@ class AnimationPlayer:
         Параметры:
         animation_type (str): Тип анимации для эффекта частиц (например, 'flame', 'aura' и т.д.).
         pos (tuple): Кортеж с координатами (x, y) для размещения эффекта частиц.
-        groups (list): Группы спрайтов, в которые добавляется объект ParticleEffect.
+        groups (list): Группы спрайтов, в которые добавляется частица.
         """
         animation_frames = self.frames[animation_type]
-        ParticleEffect(pos, animation_frames, groups)
+        self.spawn(pos, animation_frames, groups)
+
+    def spawn(self, pos, animation_frames, groups):
+        """
+        Создает частицу в пуле частиц или, если пула нет, спрайтом ParticleEffect.
+
+        Параметры:
+        pos (tuple): Кортеж с координатами (x, y) центра частицы.
+        animation_frames (list): Кадры анимации частицы.
+        groups (list): Группы спрайтов; камера рисует частицы пула, в остальные группы (например,
+        attack_sprites) добавляется заместитель частицы для столкновений.
+        """
+        if self.particles is not None:
+            self.particles.spawn(animation_frames, pos, groups)
+        else:
+            ParticleEffect(pos, animation_frames, groups)
 
     @staticmethod
     def import_folder(folder_path):
@@ -93,13 +108,20 @@ class AnimationPlayer:
         Возвращает:
         list: Список изображений (pygame.Surface).
         """
-        frames = []
+        return assets.folder(folder_path)
 
-        file_names = os.listdir(folder_path)
+    @staticmethod
+    def import_reflected_folder(folder_path):
+        """
+        Возвращает зеркальные копии всех изображений из указанной папки folder_path.
 
-        for file_name in file_names:
-            full_path = os.path.join(folder_path, file_name)
-            image_surf = pygame.image.load(full_path).convert_alpha()
-            frames.append(image_surf)
+        Исходные кадры берутся из общего кэша изображений, поэтому папка не декодируется второй раз,
+        а отраженные копии создаются один раз на файл.
 
-        return frames
+        Параметры:
+        folder_path (str): Путь к папке с изображениями.
+
+        Возвращает:
+        list: Список отраженных изображений (pygame.Surface).
+        """
+        return [assets.flipped(os.path.join(folder_path, file_name)) for file_name in os.listdir(folder_path)]
@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+import struct
+import hashlib
+import pygame
+
+# Настройки бандла
+BUNDLE_PATH = 'assets.bundle'
+BUNDLE_MAGIC = b'MGBNDL01'
+BUNDLE_ALIGN = 16
+# Папки, которые не попадают в бандл
+BUNDLE_SKIP_DIRS = {'.git', '.idea', '__pycache__', 'atlas'}
+
+
+class AssetBundle:
+    """
+    Сборщик бандла с заранее декодированными изображениями.
+
+    Все PNG игры декодируются один раз при сборке, приводятся к формату дисплея (convert_alpha)
+    и записываются сырыми пикселями в один файл с индексом. Во время игры AssetManager отображает
+    бандл в память (mmap) и создает поверхности через pygame.image.frombuffer, без декодирования PNG.
+
+    Формат файла: BUNDLE_MAGIC, длина индекса (uint32), индекс в JSON, выравнивание до BUNDLE_ALIGN,
+    затем пиксели кадров подряд (одинаковые изображения записываются один раз). Индекс хранит формат
+    пикселей и для каждого файла смещение, размер, а также mtime и размер исходного PNG, чтобы устаревшие
+    записи грузились из PNG.
+
+    Запуск из папки игры:
+        python AssetBundle.py [корневая_папка]
+
+    Attributes:
+        root (str): Папка, относительно которой записываются пути (папка запуска игры).
+        entries (list): Кортежи (путь, подготовленная поверхность, stat исходного файла).
+
+    Methods:
+        pixel_format(surface): Возвращает порядок байт пикселя поверхности (например, 'BGRA').
+        collect(): Декодирует все PNG под корневой папкой.
+        save(path): Записывает бандл.
+    """
+    def __init__(self, root='.'):
+        self.root = root
+        self.entries = []
+
+    @staticmethod
+    def pixel_format(surface):
+        """
+        Возвращает порядок каналов в памяти для 32-битной поверхности в виде строки для tobytes/frombuffer.
+
+        Parameters:
+            surface (pygame.Surface): Поверхность с альфа-каналом.
+
+        Returns:
+            str: Например 'BGRA' для ARGB8888 на little-endian.
+        """
+        order = ''.join(channel for shift, channel in sorted(zip(surface.get_shifts(), 'RGBA')))
+        return order if sys.byteorder == 'little' else order[::-1]
+
+    def collect(self):
+        """
+        Декодирует все PNG под корневой папкой и приводит их к формату дисплея.
+        """
+        for folder, dir_names, file_names in os.walk(self.root):
+            dir_names[:] = sorted(name for name in dir_names if name not in BUNDLE_SKIP_DIRS)
+            for file_name in sorted(file_names):
+                if not file_name.lower().endswith('.png'):
+                    continue
+                path = os.path.join(folder, file_name)
+                surface = pygame.image.load(path).convert_alpha()
+                self.entries.append((os.path.normpath(os.path.relpath(path, self.root)), surface, os.stat(path)))
+
+    def save(self, path=BUNDLE_PATH):
+        """
+        Записывает бандл: заголовок, индекс и сырые пиксели.
+
+        Parameters:
+            path (str): Путь к файлу бандла относительно корневой папки.
+        """
+        pixel_format = self.pixel_format(pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha())
+        index = {'format': pixel_format, 'frames': {}}
+        blobs = []
+        offsets = {}
+        offset = 0
+        for name, surface, stat in self.entries:
+            data = pygame.image.tobytes(surface, pixel_format)
+            # Одинаковые изображения из разных папок хранятся один раз
+            digest = hashlib.sha1(data).digest()
+            if digest not in offsets:
+                offsets[digest] = offset
+                blobs.append(data)
+                padding = -len(data) % BUNDLE_ALIGN
+                blobs.append(bytes(padding))
+                offset += len(data) + padding
+            index['frames'][name] = {'offset': offsets[digest], 'length': len(data), 'width': surface.get_width(),
+                                     'height': surface.get_height(), 'mtime': stat.st_mtime, 'size': stat.st_size}
+
+        header = json.dumps(index, ensure_ascii=False).encode('utf-8')
+        header_size = len(BUNDLE_MAGIC) + 4 + len(header)
+        with open(os.path.join(self.root, path), 'wb') as file:
+            file.write(BUNDLE_MAGIC)
+            file.write(struct.pack('<I', len(header)))
+            file.write(header)
+            file.write(bytes(-header_size % BUNDLE_ALIGN))
+            for blob in blobs:
+                file.write(blob)
+
+
+if __name__ == '__main__':
+    # Для convert_alpha нужен дисплей; окно не показывается
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    bundle = AssetBundle(sys.argv[1] if len(sys.argv) > 1 else '.')
+    bundle.collect()
+    bundle.save()
+    print(f'{len(bundle.entries)} изображений записано в {BUNDLE_PATH}')
@@ -0,0 +1,457 @@
+import os
+import io
+import json
+import mmap
+import struct
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+# Бюджет памяти для выгружаемых изображений (в байтах)
+ASSET_BUDGET = 32 * 1024 * 1024
+
+# Манифест текстурного атласа (собирается AtlasBuilder.py)
+ATLAS_MANIFEST = os.path.join('atlas', 'atlas.json')
+
+# Бандл с декодированными изображениями (собирается AssetBundle.py)
+BUNDLE_PATH = 'assets.bundle'
+BUNDLE_MAGIC = b'MGBNDL01'
+BUNDLE_ALIGN = 16
+
+# Количество потоков для фоновой предзагрузки изображений
+PRELOAD_WORKERS = 4
+
+
+class AssetManager:
+    """
+    Общий кэш изображений игры.
+
+    Каждый путь загружается с диска один раз, все загрузчики получают одну и ту же подготовленную
+    (convert/convert_alpha) поверхность. Файлы с одинаковым содержимым в разных папках декодируются
+    один раз и делят поверхность. Изображения, загруженные с evictable=True, учитываются в LRU-бюджете
+    и выгружаются из кэша самыми давно неиспользованными, остальные закреплены на все время игры.
+    Если собран текстурный атлас (AtlasBuilder.py), кадры из него выдаются как subsurface листа атласа
+    без открытия отдельных файлов; кадры, чей исходный файл изменился после сборки, грузятся с диска.
+    Если собран бандл (AssetBundle.py), изображения создаются прямо из отображенного в память файла
+    через pygame.image.frombuffer без декодирования PNG; бандл имеет приоритет над атласом.
+    Метод preload() декодирует PNG в фоновых потоках (например, пока показываются вступительные экраны),
+    а pump() и image() приводят готовые изображения к формату дисплея в главном потоке.
+
+    Attributes:
+        budget (int): Бюджет памяти для выгружаемых изображений в байтах.
+        surfaces (dict): Ключ (путь, alpha) или производный ключ -> поверхность.
+        content_keys (dict): Ключ контента (хеш файла, alpha) -> множество ключей surfaces с этим содержимым.
+        content_of (dict): Ключ surfaces -> ключ контента.
+        evictable (OrderedDict): Ключ контента -> размер в байтах, в порядке последнего использования.
+        evictable_bytes (int): Текущий объем выгружаемых изображений.
+        hits (int): Количество запросов, обслуженных из кэша.
+        misses (int): Количество запросов, не найденных в кэше (кадр берется из файла, бандла или атласа).
+        duplicates (int): Количество файлов, совпавших по содержимому с уже загруженными.
+        evictions (int): Количество выгруженных изображений.
+        atlas (dict): Путь кадра -> (номер листа, прямоугольник) из манифеста атласа.
+        atlas_sheets (list): Загруженные листы атласа.
+        atlas_frames (dict): (номер листа, прямоугольник) -> subsurface, общий для одинаковых кадров.
+        bundle (dict): Путь -> запись индекса бандла для неустаревших изображений.
+        bundle_map (mmap.mmap): Отображенный в память файл бандла.
+        bundle_format (str): Порядок каналов пикселей в бандле.
+        bundle_frames (int): Количество изображений, созданных из бандла.
+        executor (ThreadPoolExecutor): Потоки фоновой предзагрузки (создаются при первом preload).
+        preloading (dict): Путь -> (future с результатом decode, alpha, evictable) для еще не подготовленных
+            изображений.
+
+    Methods:
+        load_atlas(manifest_path): Загружает листы текстурного атласа.
+        load_bundle(path): Отображает в память бандл декодированных изображений.
+        preload(paths, alpha, evictable): Запускает фоновое декодирование изображений.
+        pump(limit): Подготавливает в главном потоке изображения, уже декодированные в фоне.
+        image(path, alpha, evictable): Возвращает поверхность изображения.
+        images(paths, alpha, evictable): Возвращает список поверхностей.
+        folder(folder_path): Возвращает поверхности всех изображений папки.
+        flipped(path, flip_x, flip_y): Возвращает отраженную копию изображения.
+        faded(surface, alpha): Возвращает копию поверхности с общей прозрачностью.
+        faded_frames(frames, alpha): Возвращает прозрачные копии кадров анимации.
+        stats(): Возвращает статистику кэша.
+    """
+    def __init__(self, budget=ASSET_BUDGET):
+        self.budget = budget
+        self.surfaces = {}
+        self.content_keys = {}
+        self.content_of = {}
+        self.evictable = OrderedDict()
+        self.evictable_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.duplicates = 0
+        self.evictions = 0
+        self.atlas = None
+        self.atlas_sheets = []
+        self.atlas_frames = {}
+        self.bundle = None
+        self.bundle_map = None
+        self.bundle_format = None
+        self.bundle_frames = 0
+        self.executor = None
+        self.preloading = {}
+        self.faded_sources = {}
+
+    def load_atlas(self, manifest_path=ATLAS_MANIFEST):
+        """
+        Загружает листы текстурного атласа и таблицу кадров. Без манифеста атлас просто пуст.
+
+        Parameters:
+            manifest_path (str): Путь к манифесту атласа.
+        """
+        self.atlas = {}
+        if not os.path.exists(manifest_path):
+            return
+
+        with open(manifest_path, encoding='utf-8') as file:
+            manifest = json.load(file)
+        self.atlas_sheets = [pygame.image.load(name).convert_alpha() for name in manifest['sheets']]
+
+        for path, frame in manifest['frames'].items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # Файл изменился после сборки атласа - такой кадр загружается с диска
+            if stat.st_mtime != frame['mtime'] or stat.st_size != frame['size']:
+                continue
+            self.atlas[path] = (frame['sheet'], tuple(frame['rect']))
+
+    def load_bundle(self, path=BUNDLE_PATH):
+        """
+        Отображает бандл в память и читает его индекс. Если бандла нет или он собран под другой
+        формат пикселей дисплея, бандл не используется; записи с изменившимся PNG пропускаются.
+
+        Parameters:
+            path (str): Путь к файлу бандла.
+        """
+        self.bundle = {}
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            mapped.close()
+            return
+
+        (index_length,) = struct.unpack_from('<I', mapped, len(BUNDLE_MAGIC))
+        index_start = len(BUNDLE_MAGIC) + 4
+        index = json.loads(mapped[index_start:index_start + index_length].decode('utf-8'))
+        data_start = index_start + index_length
+        data_start += -data_start % BUNDLE_ALIGN
+
+        display_format = AssetBundle.pixel_format(pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha())
+        if index['format'] != display_format:
+            mapped.close()
+            return
+
+        for name, frame in index['frames'].items():
+            try:
+                stat = os.stat(name)
+            except OSError:
+                continue
+            if stat.st_mtime != frame['mtime'] or stat.st_size != frame['size']:
+                continue
+            self.bundle[name] = (data_start + frame['offset'], frame['length'], frame['width'], frame['height'])
+        self.bundle_map = mapped
+        self.bundle_format = index['format']
+
+    def from_bundle(self, entry, alpha):
+        """
+        Создает поверхность поверх пикселей бандла без копирования и декодирования.
+
+        Parameters:
+            entry (tuple): (смещение, длина, ширина, высота) из индекса бандла.
+            alpha (bool): Нужен ли альфа-канал; без него поверхность приводится через convert.
+
+        Returns:
+            pygame.Surface: Поверхность изображения.
+        """
+        offset, length, width, height = entry
+        pixels = memoryview(self.bundle_map)[offset:offset + length]
+        surface = pygame.image.frombuffer(pixels, (width, height), self.bundle_format)
+        self.bundle_frames += 1
+        return surface if alpha else surface.convert()
+
+    @staticmethod
+    def decode(path):
+        """
+        Читает и декодирует PNG без привязки к дисплею; безопасно вызывать из фонового потока.
+
+        Parameters:
+            path (str): Путь к файлу изображения.
+
+        Returns:
+            tuple: (хеш содержимого файла, неподготовленная поверхность).
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        return hashlib.sha1(data).hexdigest(), pygame.image.load(io.BytesIO(data), os.path.basename(path))
+
+    def preload(self, paths, alpha=True, evictable=False):
+        """
+        Запускает декодирование изображений в фоновых потоках. Изображения, которые уже в кэше
+        или берутся из бандла или атласа, пропускаются.
+
+        Parameters:
+            paths (list): Пути к файлам изображений.
+            alpha (bool): Будут ли изображения запрошены с альфа-каналом.
+            evictable (bool): Будут ли изображения запрошены как выгружаемые (pump() кладет их в кэш так же).
+        """
+        if self.atlas is None:
+            self.load_bundle()
+            self.load_atlas()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=PRELOAD_WORKERS)
+
+        for path in paths:
+            name = os.path.normpath(path)
+            if (path, alpha) in self.surfaces or path in self.preloading:
+                continue
+            if name in self.bundle or (alpha and name in self.atlas):
+                continue
+            self.preloading[path] = (self.executor.submit(self.decode, path), alpha, evictable)
+
+    def pump(self, limit=None):
+        """
+        Приводит к формату дисплея изображения, уже декодированные в фоне. Вызывается из главного
+        потока между кадрами; изображения с ошибкой загрузки оставляются до запроса через image().
+
+        Parameters:
+            limit (int): Наибольшее количество изображений за вызов (None - все готовые).
+
+        Returns:
+            int: Количество изображений, которые еще декодируются.
+        """
+        ready = [(path, alpha, evictable) for path, (future, alpha, evictable) in self.preloading.items()
+                 if future.done() and future.exception() is None]
+        for path, alpha, evictable in ready[:limit]:
+            self.image(path, alpha, evictable)
+        return sum(1 for future, alpha, evictable in self.preloading.values() if not future.done())
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def image(self, path, alpha=True, evictable=False):
+        """
+        Возвращает подготовленную поверхность изображения, загружая файл только при первом запросе.
+
+        Parameters:
+            path (str): Путь к файлу изображения.
+            alpha (bool): Подготовить поверхность через convert_alpha (иначе convert).
+            evictable (bool): Разрешить выгрузку изображения из кэша при превышении бюджета.
+
+        Returns:
+            pygame.Surface: Общая поверхность; ее нельзя изменять на месте.
+        """
+        key = (path, alpha)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.touch(key, evictable)
+            return surface
+
+        if self.atlas is None:
+            self.load_bundle()
+            self.load_atlas()
+        name = os.path.normpath(path)
+
+        entry = self.bundle.get(name)
+        if entry is not None:
+            self.misses += 1
+            content = ('bundle', entry[0], alpha)
+            if content in self.content_keys:
+                surface = self.surfaces[next(iter(self.content_keys[content]))]
+            else:
+                surface = self.from_bundle(entry, alpha)
+                self.content_keys[content] = set()
+                # Кадр с альфа-каналом - это страницы отображенного файла, а не память процесса:
+                # бюджет учитывает только копии, приведенные через convert
+                if evictable and not alpha:
+                    self.evictable[content] = self.surface_bytes(surface)
+                    self.evictable_bytes += self.evictable[content]
+            self.surfaces[key] = surface
+            self.content_keys[content].add(key)
+            self.content_of[key] = content
+            self.touch(key, evictable)
+            self.enforce_budget()
+            return surface
+
+        region = self.atlas.get(name) if alpha else None
+        if region is not None:
+            # Первое обращение к кадру атласа - промах, как и загрузка из файла или бандла
+            self.misses += 1
+            surface = self.atlas_frames.get(region)
+            if surface is None:
+                surface = self.atlas_frames[region] = self.atlas_sheets[region[0]].subsurface(region[1])
+            self.surfaces[key] = surface
+            self.content_keys.setdefault(region, set()).add(key)
+            self.content_of[key] = region
+            return surface
+
+        self.misses += 1
+        preloaded = self.preloading.pop(path, None)
+        if preloaded is not None and preloaded[1] == alpha:
+            # Файл уже прочитан и декодирован в фоновом потоке
+            digest, decoded = preloaded[0].result()
+        else:
+            with open(path, 'rb') as file:
+                data = file.read()
+            digest, decoded = hashlib.sha1(data).hexdigest(), None
+        content = (digest, alpha)
+
+        if content in self.content_keys:
+            # Такой же файл уже загружен из другой папки
+            self.duplicates += 1
+            surface = self.surfaces[next(iter(self.content_keys[content]))]
+        else:
+            if decoded is None:
+                decoded = pygame.image.load(io.BytesIO(data), os.path.basename(path))
+            surface = decoded.convert_alpha() if alpha else decoded.convert()
+            self.content_keys[content] = set()
+            if evictable:
+                self.evictable[content] = self.surface_bytes(surface)
+                self.evictable_bytes += self.evictable[content]
+
+        self.surfaces[key] = surface
+        self.content_keys[content].add(key)
+        self.content_of[key] = content
+        self.touch(key, evictable)
+        self.enforce_budget()
+        return surface
+
+    def images(self, paths, alpha=True, evictable=False):
+        """
+        Возвращает список подготовленных поверхностей для списка путей.
+        """
+        return [self.image(path, alpha, evictable) for path in paths]
+
+    def folder(self, folder_path):
+        """
+        Возвращает поверхности всех изображений папки в порядке os.listdir, как AnimationPlayer.import_folder.
+
+        Parameters:
+            folder_path (str): Путь к папке с изображениями.
+
+        Returns:
+            list: Список поверхностей.
+        """
+        return [self.image(os.path.join(folder_path, file_name)) for file_name in os.listdir(folder_path)]
+
+    def flipped(self, path, flip_x=True, flip_y=False):
+        """
+        Возвращает отраженную копию изображения, создавая ее один раз.
+
+        Parameters:
+            path (str): Путь к файлу исходного изображения.
+            flip_x (bool): Отразить по горизонтали.
+            flip_y (bool): Отразить по вертикали.
+
+        Returns:
+            pygame.Surface: Общая отраженная поверхность.
+        """
+        key = ('flip', path, flip_x, flip_y)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        surface = pygame.transform.flip(self.image(path), flip_x, flip_y)
+        self.surfaces[key] = surface
+        return surface
+
+    def faded(self, surface, alpha):
+        """
+        Возвращает копию поверхности с общей прозрачностью alpha, создавая ее один раз.
+        Исходная поверхность не изменяется: кадры анимаций общие для всех спрайтов.
+
+        Parameters:
+            surface (pygame.Surface): Исходная поверхность.
+            alpha (int): Прозрачность копии (0 - 255).
+
+        Returns:
+            pygame.Surface: Общая прозрачная копия.
+        """
+        key = ('fade', id(surface), alpha)
+        faded = self.surfaces.get(key)
+        if faded is not None:
+            self.hits += 1
+            return faded
+
+        faded = surface.copy()
+        faded.set_alpha(alpha)
+        self.surfaces[key] = faded
+        # Исходная поверхность удерживается, чтобы ее id не достался другой поверхности
+        self.faded_sources[key] = surface
+        return faded
+
+    def faded_frames(self, frames, alpha):
+        """
+        Возвращает прозрачные копии кадров анимации.
+
+        Parameters:
+            frames (list): Кадры анимации.
+            alpha (int): Прозрачность копий.
+
+        Returns:
+            list: Копии кадров в том же порядке.
+        """
+        return [self.faded(frame, alpha) for frame in frames]
+
+    def touch(self, key, evictable):
+        content = self.content_of[key]
+        if content in self.evictable:
+            if evictable:
+                self.evictable.move_to_end(content)
+            else:
+                # Изображение понадобилось как постоянное - закрепляем его
+                self.evictable_bytes -= self.evictable.pop(content)
+
+    def enforce_budget(self):
+        """
+        Выгружает самые давно использованные выгружаемые изображения, пока объем не уложится в бюджет.
+        Поверхности, на которые еще ссылаются спрайты, продолжают жить у них.
+        """
+        while self.evictable_bytes > self.budget and len(self.evictable) > 1:
+            content, size = self.evictable.popitem(last=False)
+            self.evictable_bytes -= size
+            self.evictions += 1
+            for key in self.content_keys.pop(content):
+                del self.surfaces[key]
+                del self.content_of[key]
+
+    def stats(self):
+        """
+        Возвращает статистику кэша.
+
+        Returns:
+            dict: Попадания, промахи, дубликаты, выгрузки и занятая память (total_bytes - пиксели, принадлежащие
+                процессу, bundle_bytes - пиксели кадров, отображенные из файла бандла).
+        """
+        requests = self.hits + self.misses
+        mapped = {self.surfaces[next(iter(keys))] for content, keys in self.content_keys.items()
+                  if content[0] == 'bundle' and content[2]}
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'duplicates': self.duplicates,
+            'evictions': self.evictions,
+            'images': len(self.surfaces),
+            'atlas_frames': len(self.atlas_frames),
+            'bundle_frames': self.bundle_frames,
+            'evictable_bytes': self.evictable_bytes,
+            'total_bytes': sum(self.surface_bytes(surface) for surface in set(self.surfaces.values())
+                               if surface.get_parent() is None and surface not in mapped) +
+                           sum(self.surface_bytes(sheet) for sheet in self.atlas_sheets),
+            'bundle_bytes': sum(self.surface_bytes(surface) for surface in mapped),
+        }
+
+
+# Общий кэш изображений для всех загрузчиков
+assets = AssetManager()
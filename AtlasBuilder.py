@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import hashlib
+import pygame
+
+# Настройки атласа
+ATLAS_DIR = 'atlas'
+ATLAS_MANIFEST = os.path.join(ATLAS_DIR, 'atlas.json')
+ATLAS_SHEET_SIZE = 2048
+ATLAS_PADDING = 1
+# Изображения больше этого размера (карта, фоновые обои) остаются отдельными файлами
+ATLAS_MAX_FRAME = 512
+# Папки, которые не попадают в атлас
+ATLAS_SKIP_DIRS = {'.git', '.idea', '__pycache__', ATLAS_DIR}
+
+
+class AtlasBuilder:
+    """
+    Офлайн-сборщик текстурного атласа.
+
+    Собирает все PNG-кадры игры (игрок, монстры, частицы, оружие, объекты) в несколько больших листов
+    ATLAS_SHEET_SIZE x ATLAS_SHEET_SIZE и пишет манифест с положением каждого кадра. Во время игры
+    AssetManager загружает листы и выдает кадры как subsurface вместо отдельных файлов.
+    Одинаковые по содержимому файлы занимают в атласе одно место.
+
+    Запуск из папки игры:
+        python AtlasBuilder.py [корневая_папка]
+
+    Attributes:
+        root (str): Папка, относительно которой записываются пути кадров (папка запуска игры).
+        frames (list): Найденные кадры: словари с путем, хешем, размером и данными файла.
+        sheets (list): Листы атласа, каждый - список размещенных кадров.
+
+    Methods:
+        collect(): Находит все подходящие PNG-файлы.
+        pack(): Раскладывает кадры по листам полками.
+        save(): Сохраняет листы и манифест.
+    """
+    def __init__(self, root='.'):
+        self.root = root
+        self.frames = []
+        self.sheets = []
+
+    def collect(self):
+        """
+        Находит все PNG-файлы под корневой папкой, которые помещаются в атлас.
+        """
+        for folder, dir_names, file_names in os.walk(self.root):
+            dir_names[:] = sorted(name for name in dir_names if name not in ATLAS_SKIP_DIRS)
+            for file_name in sorted(file_names):
+                if not file_name.lower().endswith('.png'):
+                    continue
+                path = os.path.join(folder, file_name)
+                surface = pygame.image.load(path)
+                width, height = surface.get_size()
+                if width > ATLAS_MAX_FRAME or height > ATLAS_MAX_FRAME:
+                    continue
+                with open(path, 'rb') as file:
+                    digest = hashlib.sha1(file.read()).hexdigest()
+                stat = os.stat(path)
+                self.frames.append({
+                    'path': os.path.normpath(os.path.relpath(path, self.root)),
+                    'digest': digest,
+                    'surface': surface,
+                    'mtime': stat.st_mtime,
+                    'size': stat.st_size,
+                })
+
+    def pack(self):
+        """
+        Раскладывает уникальные кадры по листам полками: кадры сортируются по высоте,
+        заполняют полку слева направо, затем начинается новая полка или новый лист.
+        """
+        unique = {}
+        for frame in self.frames:
+            unique.setdefault(frame['digest'], frame)
+
+        placed = {}
+        x = y = shelf_height = 0
+        sheet = None
+        for frame in sorted(unique.values(), key=lambda item: (-item['surface'].get_height(), item['path'])):
+            width, height = frame['surface'].get_size()
+            if sheet is not None and x + width > ATLAS_SHEET_SIZE:
+                x, y, shelf_height = 0, y + shelf_height + ATLAS_PADDING, 0
+            if sheet is None or y + height > ATLAS_SHEET_SIZE:
+                sheet = []
+                self.sheets.append(sheet)
+                x = y = shelf_height = 0
+            sheet.append((frame, (x, y, width, height)))
+            placed[frame['digest']] = (len(self.sheets) - 1, (x, y, width, height))
+            x += width + ATLAS_PADDING
+            shelf_height = max(shelf_height, height)
+
+        for frame in self.frames:
+            frame['sheet'], frame['rect'] = placed[frame['digest']]
+
+    def save(self):
+        """
+        Сохраняет листы атласа в ATLAS_DIR и манифест ATLAS_MANIFEST.
+        """
+        os.makedirs(os.path.join(self.root, ATLAS_DIR), exist_ok=True)
+        sheet_names = []
+        for index, sheet in enumerate(self.sheets):
+            width = max(rect[0] + rect[2] for frame, rect in sheet)
+            height = max(rect[1] + rect[3] for frame, rect in sheet)
+            sheet_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            for frame, rect in sheet:
+                sheet_surface.blit(frame['surface'], rect[:2])
+            sheet_name = os.path.join(ATLAS_DIR, f'atlas_{index}.png')
+            pygame.image.save(sheet_surface, os.path.join(self.root, sheet_name))
+            sheet_names.append(sheet_name)
+
+        manifest = {
+            'sheets': sheet_names,
+            'frames': {
+                frame['path']: {'sheet': frame['sheet'], 'rect': list(frame['rect']),
+                                'mtime': frame['mtime'], 'size': frame['size']}
+                for frame in self.frames
+            },
+        }
+        with open(os.path.join(self.root, ATLAS_MANIFEST), 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    builder = AtlasBuilder(sys.argv[1] if len(sys.argv) > 1 else '.')
+    builder.collect()
+    builder.pack()
+    builder.save()
+    print(f'{len(builder.frames)} кадров упаковано в {len(builder.sheets)} листов')
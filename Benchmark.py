@@ -0,0 +1,115 @@
+import os
+import sys
+import random
+import pygame
+
+# Настройки бенчмарка
+BENCHMARK_FRAMES = 600
+BENCHMARK_WARMUP = 60
+BENCHMARK_SEED = 1
+# Модули, которые загружаются первыми (базовые классы других модулей)
+BENCHMARK_FIRST_MODULES = ('Entity.py',)
+# Модули, которые не загружаются вместе с игрой (точки входа)
+BENCHMARK_SKIP_MODULES = ('main.py', 'Benchmark.py')
+
+
+class Benchmark:
+    """
+    Безоконный прогон игры с замером времени фаз кадра.
+
+    Игра создается с видеодрайвером SDL dummy (без окна и клавиатуры) и прогоняет заданное количество кадров
+    Level.run. Первые кадры прогрева не учитываются. Время фаз (custom_draw, update, enemy_update,
+    player_attack_logic, ui.display) записывает FrameTimer уровня, а весь кадр целиком - фаза 'frame'.
+    Случайные числа фиксируются, поэтому прогоны одной сборки сравнимы между собой. С записью ввода
+    (python main.py --record файл) игрок повторяет записанную сессию с ее зерном random, и прогоны
+    разных сборок проходят одинаково.
+
+    Запуск из папки игры:
+        python Benchmark.py [кадры] [--dirty-rects] [--streaming] [--replay файл]
+    Модули игры ссылаются друг на друга по имени без import, поэтому при запуске из командной строки
+    load_game_modules() выполняет все модули папки скрипта в одном пространстве имен, как в собранной игре.
+
+    Attributes:
+        frames (int): Количество замеряемых кадров.
+        warmup (int): Количество кадров прогрева.
+        dirty_rects (bool): Режим грязных прямоугольников.
+        streaming (bool): Потоковая подгрузка карты.
+        replay_path (str): Запись ввода для воспроизведения (None - без ввода).
+        game (Game): Игра, созданная для прогона.
+
+    Methods:
+        load_game_modules(folder): Загружает модули игры в одно пространство имен.
+        run(): Выполняет прогон и возвращает FrameTimer с замерами.
+    """
+    def __init__(self, frames=BENCHMARK_FRAMES, warmup=BENCHMARK_WARMUP, dirty_rects=False, streaming=False,
+                 replay_path=None):
+        self.frames = frames
+        self.warmup = warmup
+        self.dirty_rects = dirty_rects
+        self.streaming = streaming
+        self.replay_path = replay_path
+        self.game = None
+
+    @staticmethod
+    def load_game_modules(folder):
+        """
+        Выполняет все модули игры из папки в одном пространстве имен (блоки запуска модулей не выполняются).
+
+        Parameters:
+            folder (str): Папка с модулями игры.
+
+        Returns:
+            dict: Пространство имен с классами и данными игры.
+        """
+        names = sorted(name for name in os.listdir(folder)
+                       if name.endswith('.py') and name not in BENCHMARK_SKIP_MODULES)
+        names.sort(key=lambda name: name not in BENCHMARK_FIRST_MODULES)
+        namespace = {'__name__': 'game'}
+        for name in names:
+            path = os.path.join(folder, name)
+            with open(path, encoding='utf-8') as file:
+                exec(compile(file.read(), path, 'exec'), namespace)
+        return namespace
+
+    def run(self):
+        """
+        Создает игру без окна и прогоняет кадры прогрева и замера.
+
+        Returns:
+            FrameTimer: Таймер уровня с замерами всех фаз.
+        """
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        random.seed(BENCHMARK_SEED)
+        self.game = Game(self.dirty_rects, self.streaming, replay_path=self.replay_path)
+        level = self.game.level
+        timer = level.frame_timer
+
+        for frame in range(self.warmup + self.frames):
+            if frame == self.warmup:
+                timer.reset()
+                timer.enabled = True
+            pygame.event.pump()
+            with timer.phase('frame'):
+                if self.dirty_rects:
+                    level.run()
+                    pygame.display.update(level.changed_rects())
+                else:
+                    self.game.screen.fill('black')
+                    level.run()
+                    pygame.display.update()
+
+        timer.enabled = False
+        return timer
+
+
+if __name__ == '__main__':
+    globals().update((name, value) for name, value in
+                     Benchmark.load_game_modules(os.path.dirname(os.path.abspath(__file__))).items()
+                     if not name.startswith('__'))
+    replay_path = sys.argv[sys.argv.index('--replay') + 1] if '--replay' in sys.argv else None
+    arguments = [argument for argument in sys.argv[1:] if not argument.startswith('--') and argument != replay_path]
+    benchmark = Benchmark(int(arguments[0]) if arguments else BENCHMARK_FRAMES,
+                          dirty_rects='--dirty-rects' in sys.argv, streaming='--streaming' in sys.argv,
+                          replay_path=replay_path)
+    print(benchmark.run().format_report())
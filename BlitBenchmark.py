@@ -0,0 +1,107 @@
+import os
+import sys
+import random
+import pygame
+from FrameTimer import FrameTimer
+
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Настройки бенчмарка отрисовки
+BLIT_SPRITE_COUNTS = (100, 1000, 10000)
+BLIT_REPEATS = 200
+BLIT_SEED = 1
+
+
+class BlitBenchmark:
+    """
+    Бенчмарк способов отрисовки спрайтов камерой.
+
+    Сравнивает на одинаковых наборах спрайтов (100, 1000 и 10000 штук со случайными позициями на экране):
+        blit - вызов display_surface.blit на каждый спрайт с позицией Vector2 (как раньше в Camera.custom_draw);
+        blits - одна последовательность (изображение, позиция) из целых чисел и один вызов Surface.blits;
+        fblits - та же последовательность через Surface.fblits (если есть в этой версии pygame).
+    Время каждого способа записывает FrameTimer, отчет - среднее и процентили в миллисекундах на кадр.
+
+    Запуск из папки игры:
+        python BlitBenchmark.py [повторы]
+
+    Attributes:
+        repeats (int): Количество замеров каждого способа на каждом наборе.
+        surface (pygame.Surface): Поверхность, на которую идет отрисовка.
+        timer (FrameTimer): Замеры по фазам вида 'blits 1000'.
+
+    Methods:
+        run(): Прогоняет все способы на всех наборах.
+    """
+    def __init__(self, repeats=BLIT_REPEATS):
+        self.repeats = repeats
+        self.surface = None
+        self.timer = FrameTimer(enabled=True)
+
+    @staticmethod
+    def make_sprites(count):
+        """
+        Создает спрайты с изображениями TILESIZE x TILESIZE в случайных местах вокруг экрана.
+
+        Parameters:
+            count (int): Количество спрайтов.
+
+        Returns:
+            list: Спрайты с image и rect.
+        """
+        images = []
+        for color in ('#71ddee', 'gold', 'red', 'blue'):
+            image = pygame.Surface((TILESIZE, TILESIZE), pygame.SRCALPHA)
+            pygame.draw.circle(image, color, (TILESIZE // 2, TILESIZE // 2), TILESIZE // 2)
+            images.append(image.convert_alpha())
+
+        sprites = []
+        for _ in range(count):
+            sprite = pygame.sprite.Sprite()
+            sprite.image = random.choice(images)
+            sprite.rect = sprite.image.get_rect(topleft=(random.randint(0, WIDTH), random.randint(0, HEIGHT)))
+            sprites.append(sprite)
+        return sprites
+
+    def draw_blit(self, sprites, offset):
+        for sprite in sprites:
+            offset_post = sprite.rect.topleft - offset
+            self.surface.blit(sprite.image, offset_post)
+
+    def blit_sequence(self, sprites, offset):
+        offset_x, offset_y = int(offset.x), int(offset.y)
+        return [(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y)) for sprite in sprites]
+
+    def run(self):
+        """
+        Прогоняет все способы отрисовки на всех наборах спрайтов.
+
+        Returns:
+            FrameTimer: Замеры по фазам '<способ> <количество>'.
+        """
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        pygame.init()
+        self.surface = pygame.display.set_mode((WIDTH, HEIGHT))
+        random.seed(BLIT_SEED)
+        offset = pygame.math.Vector2(TILESIZE // 2, TILESIZE // 2)
+
+        for count in BLIT_SPRITE_COUNTS:
+            sprites = self.make_sprites(count)
+            for _ in range(self.repeats):
+                with self.timer.phase(f'blit {count}'):
+                    self.draw_blit(sprites, offset)
+                with self.timer.phase(f'blits {count}'):
+                    self.surface.blits(self.blit_sequence(sprites, offset), doreturn=False)
+                if hasattr(self.surface, 'fblits'):
+                    with self.timer.phase(f'fblits {count}'):
+                        self.surface.fblits(self.blit_sequence(sprites, offset))
+        return self.timer
+
+
+if __name__ == '__main__':
+    benchmark = BlitBenchmark(int(sys.argv[1]) if len(sys.argv) > 1 else BLIT_REPEATS)
+    print(benchmark.run().format_report())
@@ -1,8 +1,25 @@
 import pygame
+from bisect import bisect_left
+from heapq import merge
+
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Если грязных прямоугольников больше, они объединяются в один
+DIRTY_RECT_LIMIT = 32
+
+# Surface.fblits появился в pygame 2.4 и быстрее blits
+FAST_BLITS = hasattr(pygame.Surface, 'fblits')
+
+# Изображение карты (фон уровня)
+FLOOR_IMAGE = 'карта.png'
 
 
 class Camera(pygame.sprite.Group):
-    def __init__(self):
+    def __init__(self, track_dirty=False):
         super().__init__()
 
         # Поверхность для отображения игры
@@ -16,9 +33,43 @@ class Camera(pygame.sprite.Group):
         self.offset = pygame.math.Vector2(300, 200)
 
         # Инициализация поверхности для отрисовки фона
-        self.floor_surf = pygame.image.load('карта.png').convert()
+        self.floor_surf = assets.image(FLOOR_IMAGE, alpha=False)
         self.floor_rect = self.floor_surf.get_rect(topleft=(0, 0))
 
+        # Счетчики отрисованных и отсеченных спрайтов за последний кадр
+        self.drawn_count = 0
+        self.culled_count = 0
+
+        # Порядок отрисовки: порядковые номера добавления, заранее отсортированные запеченные слои
+        # статичных спрайтов (тайлы и картинки) по чанкам карты и подвижные спрайты, которые сортируются каждый кадр
+        self.sprite_order = {}
+        self.order_counter = 0
+        self.static_keys = {}
+        self.static_chunks = {}
+        self.chunk_margin = 0
+        self.static_pending = []
+        self.dynamic_sprites = set()
+
+        # Запеченные слои чанков: ключ слоя -> StaticChunk, спрайт -> его слой
+        self.chunks = {}
+        self.sprite_chunk = {}
+
+        # Режим грязных прямоугольников: перерисовываются только изменившиеся области экрана
+        self.track_dirty = track_dirty
+        self.drawn_state = None
+        self.last_offset = None
+        self.dirty_rects = []
+
+        # Положения подвижных спрайтов до последнего шага симуляции для интерполяции
+        self.previous_positions = {}
+
+        # Пул частиц (листья, огонь, аура, лечение, смерть врагов), рисуется поверх мира одним проходом
+        self.particles = ParticleSystem(self)
+
+        # Пакетный расчет решений врагов и уровни детализации их обновления
+        self.enemy_ai = EnemyAI()
+        self.ai_scheduler = AIScheduler(self.sprite_order)
+
         """
         Класс для управления камерой в игре.
 
@@ -32,42 +83,315 @@ class Camera(pygame.sprite.Group):
             offset (pygame.math.Vector2): Вектор смещения камеры относительно игрока.
             floor_surf (pygame.Surface): Поверхность для отображения фона уровня.
             floor_rect (pygame.Rect): Прямоугольник, представляющий фоновую поверхность.
+            drawn_count (int): Количество слоев и спрайтов, отрисованных в последнем кадре.
+            culled_count (int): Количество слоев и спрайтов, отсеченных камерой в последнем кадре.
+            sprite_order (dict): Порядковый номер добавления каждого спрайта, разрешает равные centery.
+            static_keys (dict): (колонка, строка) чанка -> отсортированные ключи (centery, номер) его слоев.
+            static_chunks (dict): (колонка, строка) чанка -> запеченные слои (StaticChunk) в порядке static_keys.
+            chunk_margin (int): Насколько слои выходят за границы своих чанков (расширяет выборку чанков).
+            static_pending (list): Статичные спрайты и тайлы, еще не разложенные по слоям.
+            dynamic_sprites (set): Подвижные спрайты (игрок, враги, оружие, частицы).
+            chunks (dict): Словарь ключ слоя -> StaticChunk.
+            sprite_chunk (dict): Словарь статичный спрайт или тайл -> StaticChunk, в который он запечен.
+            track_dirty (bool): Включен ли режим грязных прямоугольников.
+            drawn_state (dict): Слой или спрайт -> (изображение, прямоугольник на экране) прошлого кадра.
+            last_offset (tuple): Смещение камеры в прошлом кадре.
+            dirty_rects (list): Области экрана, перерисованные в последнем кадре.
+            previous_positions (dict): Подвижный спрайт -> его rect.center перед последним шагом симуляции.
+            particles (ParticleSystem): Пул частиц, которые рисуются без сортировки по глубине.
+            enemy_ai (EnemyAI): Пакетный расчет статусов и направлений врагов.
+            ai_scheduler (AIScheduler): Распределение врагов по уровням детализации (активные, видимые, спящие).
 
         Methods:
-            custom_draw(player): Отображает игровые объекты с учетом смещения камеры.
+            add_tile(tile): Добавляет статичный тайл.
+            remove_tile(tile): Убирает статичный тайл.
+            draw_order(camera_rect): Возвращает видимые слои и спрайты в порядке отрисовки.
+            snapshot(): Запоминает положения подвижных спрайтов перед шагом симуляции.
+            submit(blit_sequence): Рисует последовательность изображений одним вызовом.
+            custom_draw(player, alpha): Отображает игровые объекты с учетом смещения камеры.
+            update(): Обновляет спрайты, кроме спящих врагов, и частицы.
             enemy_update(player): Обновляет положение вражеских спрайтов с учетом положения игрока.
         """
 
-    def custom_draw(self, player):
+    @staticmethod
+    def is_static(sprite):
+        return isinstance(sprite, CustomImageSprite)
+
+    """
+    Проверяет, является ли спрайт статичным (никогда не двигается после создания карты).
+    """
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        sprite_registry.add(sprite, self)
+        self.sprite_order[sprite] = self.order_counter
+        self.order_counter += 1
+        if self.is_static(sprite):
+            # rect картинки выставляется уже после добавления в группу, поэтому вставка откладывается
+            self.static_pending.append(sprite)
+        else:
+            self.dynamic_sprites.add(sprite)
+        if isinstance(sprite, Enemy):
+            self.ai_scheduler.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        sprite_registry.remove(sprite, self)
+        if sprite in self.dynamic_sprites:
+            self.sprite_order.pop(sprite, None)
+            self.dynamic_sprites.discard(sprite)
+            self.ai_scheduler.remove(sprite)
+        else:
+            self.remove_static(sprite)
 
-        # Вычисление смещения камеры относительно игрока
-        self.offset.x = player.rect.centerx - self.half_width
-        self.offset.y = player.rect.centery - self.half_height
+    def add_tile(self, tile):
+        self.sprite_order[tile] = self.order_counter
+        self.order_counter += 1
+        self.static_pending.append(tile)
 
-        # Отображение фона
-        floor_offset_pos = self.floor_rect.topleft - self.offset
-        self.display_surface.blit(self.floor_surf, floor_offset_pos)
+    def remove_tile(self, tile):
+        self.remove_static(tile)
 
-        # Отображение спрайтов с учетом смещения камеры
-        for sprite in sorted(self.sprites(), key=lambda sprite: sprite.rect.centery):
-            offset_post = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_post)
+    """
+    Добавляет статичный тайл (Tile из TileLayer) в камеру или убирает его. Тайлы не являются спрайтами группы,
+    но запекаются в слои чанков и сортируются по порядку добавления наравне со статичными спрайтами.
+    """
+
+    def remove_static(self, static):
+        order = self.sprite_order.pop(static, None)
+        if static in self.static_pending:
+            self.static_pending.remove(static)
+        elif order is not None:
+            chunk = self.sprite_chunk.pop(static)
+            self.unlink_chunk(chunk)
+            chunk.remove(static)
+            if chunk.members:
+                self.link_chunk(chunk)
+            else:
+                del self.chunks[chunk.key]
+
+    def link_chunk(self, chunk):
+        cell = chunk.key[:2]
+        keys = self.static_keys.setdefault(cell, [])
+        key = (chunk.key[2], chunk.order)
+        index = bisect_left(keys, key)
+        keys.insert(index, key)
+        self.static_chunks.setdefault(cell, []).insert(index, chunk)
+        self.chunk_margin = max(self.chunk_margin, chunk.overhang())
+
+    def unlink_chunk(self, chunk):
+        cell = chunk.key[:2]
+        keys = self.static_keys[cell]
+        index = bisect_left(keys, (chunk.key[2], chunk.order))
+        del keys[index]
+        del self.static_chunks[cell][index]
+        if not keys:
+            del self.static_keys[cell]
+            del self.static_chunks[cell]
+
+    """
+    Вставляет запеченный слой в отсортированный список слоев его чанка по ключу (centery, номер первого
+    участника) или убирает его оттуда.
+    """
+
+    def draw_order(self, camera_rect):
+        for sprite in self.static_pending:
+            key = StaticChunk.key_for(sprite)
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                chunk = self.chunks[key] = StaticChunk(key)
+            else:
+                self.unlink_chunk(chunk)
+            chunk.add(self.sprite_order[sprite], sprite)
+            self.link_chunk(chunk)
+            self.sprite_chunk[sprite] = chunk
+        self.static_pending = []
+
+        # Перебираются только чанки под камерой (с запасом на слои, выходящие за границы своего чанка)
+        chunk_pixels = CHUNK_SIZE * TILESIZE
+        first_col = (camera_rect.left - self.chunk_margin) // chunk_pixels
+        last_col = (camera_rect.right - 1 + self.chunk_margin) // chunk_pixels
+        first_row = (camera_rect.top - self.chunk_margin) // chunk_pixels
+        last_row = (camera_rect.bottom - 1 + self.chunk_margin) // chunk_pixels
+        visible = []
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                chunks = self.static_chunks.get((col, row))
+                if chunks:
+                    visible.append([item for item in zip(self.static_keys[(col, row)], chunks)
+                                    if camera_rect.colliderect(item[1].rect)])
+
+        dynamic = sorted(((sprite.rect.centery, self.sprite_order[sprite]), sprite) for sprite in self.dynamic_sprites
+                         if camera_rect.colliderect(sprite.rect))
+        # Слои каждого чанка уже отсортированы: сливаются только видимые слои, без сортировки и без прохода по миру
+        return merge(*visible, dynamic, key=lambda item: item[0])
+
+    """
+    Возвращает запеченные слои и подвижные спрайты, чей rect пересекает прямоугольник камеры, в порядке
+    отрисовки (по centery, при равенстве - по порядку добавления).
+
+    Статичные спрайты раскладываются по слоям чанков (StaticChunk) один раз, слои хранятся по чанкам карты
+    заранее отсортированными. Каждый кадр проверяются только слои чанков под камерой, поэтому стоимость
+    отсечения не растет с размером мира; подвижные спрайты отсекаются по rect и сортируются, после чего
+    видимые слои каждого чанка и подвижные спрайты сливаются.
+
+    Parameters:
+        camera_rect (pygame.Rect): Прямоугольник камеры в мировых координатах.
+
+    Returns:
+        iterator: Пары ((centery, номер), слой или спрайт).
+    """
+
+    def snapshot(self):
+        self.previous_positions = {sprite: sprite.rect.center for sprite in self.dynamic_sprites}
+
+    """
+    Запоминает центры подвижных спрайтов перед шагом симуляции, чтобы custom_draw мог нарисовать их
+    между положениями до и после шага.
+    """
+
+    def interpolation_shift(self, sprite, alpha):
+        previous = self.previous_positions.get(sprite)
+        if previous is None or alpha >= 1:
+            return 0, 0
+        shift_x = previous[0] - sprite.rect.centerx
+        shift_y = previous[1] - sprite.rect.centery
+        # Скачки больше тайла (появление, отбрасывание) не сглаживаются
+        if abs(shift_x) > TILESIZE or abs(shift_y) > TILESIZE:
+            return 0, 0
+        return round(shift_x * (1 - alpha)), round(shift_y * (1 - alpha))
+
+    """
+    Возвращает сдвиг отрисовки спрайта от его текущего положения к положению до шага симуляции
+    пропорционально доле шага, которая еще не прошла (1 - alpha).
+    """
+
+    def submit(self, blit_sequence):
+        if FAST_BLITS:
+            self.display_surface.fblits(blit_sequence)
+        else:
+            self.display_surface.blits(blit_sequence, doreturn=False)
+
+    """
+    Рисует последовательность пар (изображение, позиция) одним вызовом: Surface.fblits, если он есть
+    (pygame 2.4+), иначе Surface.blits без возврата прямоугольников.
+    """
+
+    def custom_draw(self, player, alpha=1.0):
+
+        # Вычисление смещения камеры относительно игрока (с интерполяцией между шагами симуляции)
+        shifts = {}
+        if alpha < 1:
+            for sprite in self.dynamic_sprites:
+                shift = self.interpolation_shift(sprite, alpha)
+                if shift != (0, 0):
+                    shifts[sprite] = shift
+        player_shift = shifts.get(player, (0, 0))
+        self.offset.x = player.rect.centerx + player_shift[0] - self.half_width
+        self.offset.y = player.rect.centery + player_shift[1] - self.half_height
+
+        offset_x, offset_y = int(self.offset.x), int(self.offset.y)
+        floor_offset_pos = (self.floor_rect.x - offset_x, self.floor_rect.y - offset_y)
+
+        # Отсечение спрайтов, которые не попадают в прямоугольник камеры
+        camera_rect = pygame.Rect(self.offset.x, self.offset.y, self.half_width * 2, self.half_height * 2)
+        on_screen = [sprite for key, sprite in self.draw_order(camera_rect)]
+        particles = self.particles.draw_list(self.offset)
+        self.drawn_count = len(on_screen) + len(particles)
+        self.culled_count = len(self.chunks) + len(self.dynamic_sprites) - len(on_screen)
+
+        # Слой чанка перепекается, только если изменился его состав
+        for sprite in on_screen:
+            if getattr(sprite, 'dirty', False):
+                sprite.bake()
+
+        # Одна последовательность (изображение, позиция) на кадр без Vector2 на каждый спрайт
+        blit_sequence = []
+        for sprite in on_screen:
+            rect = sprite.rect
+            if sprite in shifts:
+                shift_x, shift_y = shifts[sprite]
+                blit_sequence.append((sprite.image, (rect.x - offset_x + shift_x, rect.y - offset_y + shift_y)))
+            else:
+                blit_sequence.append((sprite.image, (rect.x - offset_x, rect.y - offset_y)))
+
+        if not self.track_dirty:
+            # Отображение фона
+            self.display_surface.blit(self.floor_surf, floor_offset_pos)
+
+            # Отображение слоев, спрайтов и частиц с учетом смещения камеры
+            blit_sequence.extend(item for slot, item in particles)
+            self.submit(blit_sequence)
+            return
+
+        # Режим грязных прямоугольников: сравнение с тем, что было нарисовано в прошлом кадре
+        state = {}
+        for sprite, (image, position) in zip(on_screen, blit_sequence):
+            state[sprite] = (image, pygame.Rect(position, sprite.rect.size))
+        for slot, item in particles:
+            state[(self.particles, slot)] = item
+
+        offset = (self.offset.x, self.offset.y)
+        if self.drawn_state is None or offset != self.last_offset:
+            self.dirty_rects = [self.display_surface.get_rect()]
+        else:
+            self.dirty_rects = []
+            for sprite, (image, rect) in state.items():
+                previous = self.drawn_state.get(sprite)
+                if previous is None:
+                    self.dirty_rects.append(rect)
+                elif previous[0] is not image or previous[1] != rect:
+                    self.dirty_rects.append(rect)
+                    self.dirty_rects.append(previous[1])
+            for sprite, (image, rect) in self.drawn_state.items():
+                if sprite not in state:
+                    self.dirty_rects.append(rect)
+            if len(self.dirty_rects) > DIRTY_RECT_LIMIT:
+                self.dirty_rects = [self.dirty_rects[0].unionall(self.dirty_rects)]
+
+        # Перерисовка только изменившихся областей
+        for area in self.dirty_rects:
+            self.display_surface.set_clip(area)
+            self.display_surface.fill('black')
+            self.display_surface.blit(self.floor_surf, floor_offset_pos)
+            self.submit([(image, rect) for image, rect in state.values() if rect.colliderect(area)])
+        self.display_surface.set_clip(None)
+
+        self.drawn_state = state
+        self.last_offset = offset
 
     """
     Отображает игровые объекты с учетом смещения камеры.
 
     Parameters:
         player (Player): Объект игрока, относительно которого смещается камера.
+        alpha (float): Доля шага симуляции после последнего update; при alpha < 1 подвижные спрайты
+            и камера рисуются между положениями до и после шага.
 
     Метод отображает фоновую поверхность уровня и игровые спрайты с учетом смещения камеры
-    относительно игрока, чтобы сосредоточить камеру на нем.
+    относительно игрока, чтобы сосредоточить камеру на нем. Рисуются только слои и спрайты, чей rect
+    пересекает прямоугольник камеры, поэтому число blit зависит от размера экрана, а не мира.
+    Трава и объекты рисуются запеченными слоями чанков вместо отдельных тайлов.
+
+    В режиме track_dirty перерисовываются только области, где слой или спрайт появился, исчез,
+    сменил изображение или сдвинулся; при сдвиге камеры перерисовывается весь экран.
+    Перерисованные области сохраняются в dirty_rects.
+    """
+
+    def update(self, *args, **kwargs):
+        # Частицы, созданные во время обновления спрайтов (огонь магии), начинают анимацию со следующего шага
+        self.particles.update()
+        is_sleeping = self.ai_scheduler.is_sleeping
+        for sprite in self.sprites():
+            if not is_sleeping(sprite):
+                sprite.update(*args, **kwargs)
+
+    """
+    Продвигает частицы пула и обновляет все спрайты группы, кроме врагов, которых AIScheduler усыпил.
     """
 
     def enemy_update(self, player):
-        enemy_sprites = [sprite for sprite in self.sprites() if hasattr(sprite, 'sprite_type') and
-                         sprite.sprite_type == 'enemy']
-        for enemy in enemy_sprites:
-            enemy.enemy_update(player)
+        self.enemy_ai.update(self.ai_scheduler.schedule(player), player)
 
     """
     Обновляет положение вражеских спрайтов с учетом положения игрока.
@@ -75,6 +399,7 @@ class Camera(pygame.sprite.Group):
     Parameters:
         player (Player): Объект игрока, используется для вычисления положения вражеских спрайтов.
 
-    Метод вызывает метод `enemy_update()` для каждого вражеского спрайта,
-    чтобы обновить их положение относительно игрока.
+    AIScheduler выбирает врагов, которым нужно принять решение в этом кадре (далекие спящие и видимые
+    враги пропускаются), и их статусы и направления считаются одним пакетом в EnemyAI
+    (без NumPy - методом `enemy_update()` каждого врага).
     """
\ No newline at end of file
@@ -0,0 +1,150 @@
+import pygame
+
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+
+class CollisionGrid(pygame.sprite.Group):
+    """
+    Сетка столкновений для статических препятствий.
+
+    Группа хранит препятствия как обычная pygame.sprite.Group, но дополнительно раскладывает их хитбоксы
+    по ячейкам размером TILESIZE. Запрос "какие препятствия пересекают этот прямоугольник" проверяет
+    только ячейки под прямоугольником, а не все препятствия карты.
+    Статичные тайлы (Tile из TileLayer) не являются спрайтами группы: они добавляются через add_tile
+    и раскладываются по ячейкам так же, как спрайты.
+
+    Attributes:
+        cells (dict): Словарь (колонка, строка) -> список спрайтов, чей хитбокс задевает ячейку.
+        sprite_cells (dict): Словарь спрайт -> список ячеек, в которые он разложен.
+        pending (list): Спрайты, добавленные в группу, но еще не разложенные по ячейкам.
+        order (dict): Порядковый номер добавления спрайта или тайла, чтобы выдавать препятствия в порядке группы.
+        version (int): Растет при каждом изменении раскладки (по нему FlowField и LineOfSight узнают,
+            что препятствия изменились).
+        blocked (bytearray): Занятость клеток карты, построенная для версии blocked_version.
+        blocked_version (int): Версия раскладки, для которой построена blocked.
+
+    Methods:
+        add_tile(tile): Добавляет статичный тайл.
+        remove_tile(tile): Удаляет статичный тайл.
+        blocked_grid(rows, cols): Возвращает занятость клеток карты препятствиями.
+        nearby(rect): Возвращает препятствия из ячеек, которые пересекает прямоугольник.
+    """
+    def __init__(self, *sprites):
+        self.cells = {}
+        self.sprite_cells = {}
+        self.pending = []
+        self.order = {}
+        self.counter = 0
+        self.version = 0
+        self.blocked = None
+        self.blocked_version = None
+        super().__init__(*sprites)
+
+    @staticmethod
+    def cells_for(rect):
+        """
+        Возвращает список ячеек сетки, которые пересекает прямоугольник.
+
+        Parameters:
+            rect (pygame.Rect): Прямоугольник в мировых координатах.
+
+        Returns:
+            list: Список кортежей (колонка, строка).
+        """
+        left = rect.left // TILESIZE
+        right = (rect.right - 1) // TILESIZE
+        top = rect.top // TILESIZE
+        bottom = (rect.bottom - 1) // TILESIZE
+        return [(col, row) for row in range(top, bottom + 1) for col in range(left, right + 1)]
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        sprite_registry.add(sprite, self)
+        self.order[sprite] = self.counter
+        self.counter += 1
+        # Хитбокс тайла выставляется уже после добавления в группу (см. Level.create_map),
+        # поэтому раскладка по ячейкам откладывается до первого запроса
+        self.pending.append(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        sprite_registry.remove(sprite, self)
+        self.unlink(sprite)
+
+    def add_tile(self, tile):
+        self.order[tile] = self.counter
+        self.counter += 1
+        self.pending.append(tile)
+
+    def remove_tile(self, tile):
+        self.unlink(tile)
+
+    def unlink(self, sprite):
+        self.order.pop(sprite, None)
+        if sprite in self.sprite_cells:
+            self.version += 1
+        for cell in self.sprite_cells.pop(sprite, ()):
+            bucket = self.cells[cell]
+            bucket.remove(sprite)
+            if not bucket:
+                del self.cells[cell]
+
+    def flush(self):
+        """
+        Раскладывает по ячейкам спрайты, добавленные с момента последнего запроса.
+        """
+        for sprite in self.pending:
+            if sprite not in self.order or sprite in self.sprite_cells:
+                continue
+            cells = self.cells_for(sprite.hitbox)
+            self.sprite_cells[sprite] = cells
+            for cell in cells:
+                self.cells.setdefault(cell, []).append(sprite)
+            self.version += 1
+        self.pending = []
+
+    def blocked_grid(self, rows, cols):
+        """
+        Возвращает занятость клеток карты: клетка занята, если ее задевает хитбокс препятствия.
+        Сетка строится заново только после изменения раскладки и общая для всех, кто ее запрашивает.
+
+        Parameters:
+            rows (int): Количество строк карты.
+            cols (int): Количество столбцов карты.
+
+        Returns:
+            bytearray: 1 для занятых клеток, номер клетки - строка * cols + столбец.
+        """
+        if self.pending:
+            self.flush()
+        if self.blocked_version != self.version or len(self.blocked) != rows * cols:
+            self.blocked = bytearray(rows * cols)
+            for col, row in self.cells:
+                if 0 <= row < rows and 0 <= col < cols:
+                    self.blocked[row * cols + col] = 1
+            self.blocked_version = self.version
+        return self.blocked
+
+    def nearby(self, rect):
+        """
+        Возвращает препятствия, чьи хитбоксы лежат в ячейках под прямоугольником.
+
+        Parameters:
+            rect (pygame.Rect): Прямоугольник запроса (обычно хитбокс сущности).
+
+        Returns:
+            list: Спрайты и тайлы препятствий в порядке их добавления в группу.
+        """
+        if self.pending:
+            self.flush()
+
+        found = set()
+        for cell in self.cells_for(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return sorted(found, key=self.order.__getitem__)
@@ -15,6 +15,6 @@ class CustomImageSprite(pygame.sprite.Sprite):
         groups (list): Список групп спрайтов, к которым будет добавлен данный спрайт.
         """
         super().__init__(groups)
-        self.image = pygame.image.load(image_path).convert_alpha()
+        self.image = assets.image(image_path, evictable=True)
         self.rect = self.image.get_rect(topleft=pos)
         self.image_name = image_name
\ No newline at end of file
@@ -11,7 +11,7 @@ monster_data = {
 
 class Enemy(Entity):
     def __init__(self, monster, pos, groups, idle_images, move_images, idle_attack, obstacle_sprites, damage_player,
-                 trigger_death_particles):
+                 trigger_death_particles, flow_field=None, line_of_sight=None):
         """
         Конструктор класса Enemy.
 
@@ -25,15 +25,18 @@ class Enemy(Entity):
         obstacle_sprites (pygame.sprite.Group): Группа спрайтов препятствий для обработки столкновений.
         damage_player (function): Функция для нанесения урона игроку.
         trigger_death_particles (function): Функция для создания эффектов при смерти монстра.
+        flow_field (FlowField): Поле направлений к игроку для обхода препятствий (None - движение прямо к игроку).
+        line_of_sight (LineOfSight): Проверка прямой видимости игрока (None - игрок виден всегда).
         """
         super().__init__(groups)
-        self.direction = None
+        self.direction = pygame.math.Vector2()
         self.animations = {'idle': [], 'move': [], 'attack': []}
         self.sprite_type = 'enemy'
 
         self.animations['idle'] = idle_images
         self.animations['move'] = move_images
         self.animations['attack'] = idle_attack
+        self.import_flash_frames()
 
         self.monster_name = monster
         monster_info = monster_data[self.monster_name]
@@ -65,6 +68,8 @@ class Enemy(Entity):
         self.rect = self.image.get_rect(topleft=pos)
         self.hitbox = self.rect.inflate(0, -10)
         self.obstacle_sprites = obstacle_sprites
+        self.flow_field = flow_field
+        self.line_of_sight = line_of_sight
 
     def get_player_distance_direction(self, player):
         """
@@ -90,6 +95,38 @@ class Enemy(Entity):
 
         return distance, direction
 
+    def path_direction(self, direction):
+        """
+        Метод для выбора направления движения к игроку в обход препятствий.
+
+        Параметры:
+        direction (pygame.math.Vector2): Единичный вектор прямо к игроку.
+
+        Возвращает:
+        pygame.math.Vector2: Направление к следующей клетке пути из поля направлений или direction,
+        если монстр уже рядом с игроком, пути нет или поля нет.
+        """
+        if self.flow_field is None:
+            return direction
+        step = self.flow_field.direction(self.hitbox.center, self.speed)
+        if step is None:
+            return direction
+        return pygame.math.Vector2(step).normalize()
+
+    def can_see(self, player):
+        """
+        Метод для проверки прямой видимости игрока.
+
+        Параметры:
+        player (Player): Объект игрока.
+
+        Возвращает:
+        bool: True, если между монстром и игроком нет препятствий.
+        """
+        if self.line_of_sight is None:
+            return True
+        return self.line_of_sight.visible(self.hitbox.center, player.hitbox.center)
+
     def get_status(self, player):
         """
         Метод для определения статуса монстра (покой, движение, атака).
@@ -98,15 +135,18 @@ class Enemy(Entity):
         player (Player): Объект игрока.
 
         Примечание:
-        Метод определяет статус монстра на основе его расстояния до игрока и устанавливает соответствующий статус.
+        Метод определяет статус монстра на основе его расстояния до игрока и прямой видимости игрока
+        и устанавливает соответствующий статус.
         """
         distance = self.get_player_distance_direction(player)[0]
+        # Монстр замечает только игрока, которого видит (не за препятствиями)
+        sees = distance <= max(self.attack_radius, self.notice_radius) and self.can_see(player)
 
-        if distance <= self.attack_radius and self.can_attack:
+        if distance <= self.attack_radius and self.can_attack and sees:
             if self.status != 'attack':
                 self.frame_index = 0
             self.status = 'attack'
-        elif distance <= self.notice_radius:
+        elif distance <= self.notice_radius and sees:
             self.status = 'move'
         else:
             self.status = 'idle'
@@ -122,11 +162,11 @@ class Enemy(Entity):
         Метод определяет действия монстра в зависимости от его статуса (покой, движение, атака).
         """
         if self.status == 'attack':
-            self.attack_time = pygame.time.get_ticks()
+            self.attack_time = sim_clock.ticks()
             self.damage_player(self.attack_damage, self.attack_type)
 
         elif self.status == 'move':
-            self.direction = self.get_player_distance_direction(player)[1]
+            self.direction = self.path_direction(self.get_player_distance_direction(player)[1])
 
         else:
             self.direction = pygame.math.Vector2()
@@ -149,15 +189,9 @@ class Enemy(Entity):
                 self.can_attack = False
             self.frame_index = 0
 
-        self.image = animation[int(self.frame_index)]
+        self.image = self.frame_image()
         self.rect = self.image.get_rect(center=self.hitbox.center)
 
-        if not self.vulnerable:
-            alpha = self.wave_value()
-            self.image.set_alpha(alpha)
-        else:
-            self.image.set_alpha(255)
-
     def attack_cooldowns(self):
         """
         Метод для обработки перезарядки атаки монстра.
@@ -165,7 +199,7 @@ class Enemy(Entity):
         Примечание:
         Метод проверяет перезарядку атаки монстра и устанавливает соответствующее состояние.
         """
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.ticks()
         if not self.can_attack:
             if current_time - self.attack_time >= self.attack_cooldown_duration:
                 self.can_attack = True
@@ -191,7 +225,7 @@ class Enemy(Entity):
                 self.health -= player.get_full_weapon_damage()
             else:
                 self.health -= player.get_full_magic_damage()
-            self.hit_time = pygame.time.get_ticks()
+            self.hit_time = sim_clock.ticks()
             self.vulnerable = False
 
     def check_death(self):
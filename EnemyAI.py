@@ -0,0 +1,93 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class EnemyAI:
+    """
+    Пакетный расчет решений врагов (статус и направление) за один векторный шаг.
+
+    Вместо вызова Enemy.enemy_update для каждого врага (где get_status и actions дважды создают Vector2
+    и считают расстояние до игрока) позиции врагов собираются в массивы NumPy, и расстояния, направления
+    и статусы считаются сразу для всех. Результат записывается обратно во врагов в том же порядке и с теми же
+    побочными эффектами (frame_index, attack_time, damage_player), что и у Enemy.get_status и Enemy.actions.
+    Расстояние и направление считаются как в Vector2 (sqrt(dx*dx + dy*dy) и деление на него), поэтому
+    статусы совпадают с поштучным расчетом. Прямую видимость (Enemy.can_see) проверяют только враги в пределах
+    радиусов, как в Enemy.get_status. Направление идущего врага уточняет Enemy.path_direction
+    по общему полю направлений, как в Enemy.actions.
+
+    Без установленного NumPy вызывается Enemy.enemy_update для каждого врага.
+
+    Attributes:
+        enemies (list): Враги, для которых собраны массивы радиусов.
+        attack_radius (numpy.ndarray): Радиусы атаки врагов.
+        notice_radius (numpy.ndarray): Радиусы обнаружения игрока.
+        sight_radius (numpy.ndarray): Расстояния, с которых проверяется прямая видимость игрока.
+
+    Methods:
+        update(enemies, player): Обновляет статусы и действия всех врагов.
+    """
+    def __init__(self):
+        self.enemies = []
+        self.attack_radius = None
+        self.notice_radius = None
+        self.sight_radius = None
+
+    def update(self, enemies, player):
+        """
+        Обновляет статусы и действия врагов относительно игрока.
+
+        Parameters:
+            enemies (list): Враги в порядке обновления.
+            player (Player): Объект игрока.
+        """
+        if np is None:
+            for enemy in enemies:
+                enemy.enemy_update(player)
+            return
+        if not enemies:
+            return
+
+        # Радиусы постоянны, массивы пересобираются только при изменении состава врагов
+        if enemies != self.enemies:
+            self.enemies = list(enemies)
+            self.attack_radius = np.array([enemy.attack_radius for enemy in enemies], dtype=np.float64)
+            self.notice_radius = np.array([enemy.notice_radius for enemy in enemies], dtype=np.float64)
+            self.sight_radius = np.maximum(self.attack_radius, self.notice_radius)
+
+        centers = np.array([enemy.rect.center for enemy in enemies], dtype=np.float64)
+        can_attack = np.array([enemy.can_attack for enemy in enemies], dtype=bool)
+        delta = np.array(player.rect.center, dtype=np.float64) - centers
+        distance = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            direction = delta / distance[:, None]
+
+        # Видимость проверяется (с кэшем LineOfSight) только у врагов в пределах радиусов
+        sees = np.zeros(len(enemies), dtype=bool)
+        for index in np.flatnonzero(distance <= self.sight_radius).tolist():
+            sees[index] = enemies[index].can_see(player)
+
+        # 0 - покой, 1 - движение, 2 - атака
+        status = np.where((distance <= self.attack_radius) & can_attack & sees, 2,
+                          np.where((distance <= self.notice_radius) & sees, 1, 0))
+
+        for enemy, code, moving, (direction_x, direction_y) in zip(enemies, status.tolist(), (distance > 0).tolist(),
+                                                                   direction.tolist()):
+            if code == 2:
+                if enemy.status != 'attack':
+                    enemy.frame_index = 0
+                enemy.status = 'attack'
+                enemy.attack_time = sim_clock.ticks()
+                enemy.damage_player(enemy.attack_damage, enemy.attack_type)
+            elif code == 1:
+                enemy.status = 'move'
+                # В точке игрока направление нулевое, как у Vector2 в get_player_distance_direction;
+                # дальше тот же Enemy.path_direction, что и в Enemy.actions
+                enemy.direction = enemy.path_direction(pygame.math.Vector2(direction_x, direction_y) if moving
+                                                       else pygame.math.Vector2())
+            else:
+                enemy.status = 'idle'
+                enemy.direction = pygame.math.Vector2()
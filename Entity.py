@@ -1,5 +1,15 @@
 import pygame
-from math import sin
+
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Прозрачность кадров мигания при неуязвимости (значения wave_value, кроме 255)
+FLASH_ALPHAS = (0,)
+# Длительность одной фазы мигания (в шагах симуляции)
+FLASH_PERIOD = 4
 
 
 class Entity(pygame.sprite.Sprite):
@@ -17,6 +27,7 @@ class Entity(pygame.sprite.Sprite):
         self.frame_index = 0  # Индекс текущего кадра анимации
         self.animation_speed = 0.15  # Скорость анимации (время между сменой кадров)
         self.direction = pygame.math.Vector2()  # Направление движения объекта
+        self.flash_animations = {}  # Прозрачность -> статус -> кадры мигания при неуязвимости
 
     def move(self, speed):
         """
@@ -45,24 +56,30 @@ class Entity(pygame.sprite.Sprite):
         direction (str): Направление столкновения ('горизонталь' или 'вертикаль').
 
         Примечание:
-        Метод проверяет столкновение объекта с препятствиями из группы препятствий и корректирует его позицию, чтобы
-        избежать пересечения с препятствиями.
+        Метод проверяет столкновение объекта с препятствиями из соседних ячеек сетки столкновений (CollisionGrid)
+        и корректирует его позицию, чтобы избежать пересечения с препятствиями.
         """
+        # Проверяются только препятствия из ячеек сетки рядом с хитбоксом (с запасом на сдвиг при коррекции)
+        obstacles = self.obstacle_sprites.nearby(self.hitbox.inflate(TILESIZE, TILESIZE))
+
+        # Хитбокс тайла вычисляется из массивов TileLayer, поэтому берется один раз на препятствие
         if direction == 'горизонталь':
-            for sprite in self.obstacle_sprites:
-                if sprite.hitbox.colliderect(self.hitbox):
+            for sprite in obstacles:
+                hitbox = sprite.hitbox
+                if hitbox.colliderect(self.hitbox):
                     if self.direction.x > 0:
-                        self.hitbox.right = sprite.hitbox.left
+                        self.hitbox.right = hitbox.left
                     if self.direction.x < 0:
-                        self.hitbox.left = sprite.hitbox.right
+                        self.hitbox.left = hitbox.right
 
         if direction == 'вертикаль':
-            for sprite in self.obstacle_sprites:
-                if sprite.hitbox.colliderect(self.hitbox):
+            for sprite in obstacles:
+                hitbox = sprite.hitbox
+                if hitbox.colliderect(self.hitbox):
                     if self.direction.y > 0:
-                        self.hitbox.bottom = sprite.hitbox.top
+                        self.hitbox.bottom = hitbox.top
                     if self.direction.y < 0:
-                        self.hitbox.top = sprite.hitbox.bottom
+                        self.hitbox.top = hitbox.bottom
 
     @staticmethod
     def wave_value():
@@ -70,13 +87,38 @@ class Entity(pygame.sprite.Sprite):
         Статический метод для вычисления значения волны.
 
         Возвращает:
-        int: Значение волны от 0 до 255 в зависимости от текущего времени.
+        int: 255 или 0 в зависимости от текущего шага симуляции.
 
         Примечание:
-        Метод использует функцию синуса для создания эффекта "волны" при задержке времени.
+        Значение меняется каждые FLASH_PERIOD шагов, поэтому мигание имеет постоянную частоту
+        и не зависит от частоты кадров.
         """
-        value = sin(pygame.time.get_ticks())
-        if value >= 0:
+        if (sim_clock.steps // FLASH_PERIOD) % 2 == 0:
             return 255
         else:
             return 0
+
+    def import_flash_frames(self):
+        """
+        Готовит кадры мигания при неуязвимости.
+
+        Примечание:
+        Для каждой прозрачности из FLASH_ALPHAS создаются (один раз на кадр через assets.faded) прозрачные
+        копии всех кадров self.animations. Мигание выбирает копию вместо вызова set_alpha на общем кадре.
+        """
+        self.flash_animations = {alpha: {status: assets.faded_frames(frames, alpha)
+                                         for status, frames in self.animations.items()}
+                                 for alpha in FLASH_ALPHAS}
+
+    def frame_image(self):
+        """
+        Возвращает изображение текущего кадра анимации с учетом мигания при неуязвимости.
+
+        Возвращает:
+        pygame.Surface: Кадр анимации или его прозрачная копия.
+        """
+        if not self.vulnerable:
+            alpha = self.wave_value()
+            if alpha != 255:
+                return self.flash_animations[alpha][self.status][int(self.frame_index)]
+        return self.animations[self.status][int(self.frame_index)]
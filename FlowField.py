@@ -0,0 +1,151 @@
+from array import array
+from collections import deque
+
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Наибольшая длина пути в клетках, которую строит поле (враги замечают игрока с 360 пикселей)
+FLOW_RADIUS = 16
+# Соседние клетки: сначала прямые, затем диагональные (при равной длине пути предпочитается прямой шаг)
+FLOW_NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1))
+NO_CELL = -1
+
+
+class FlowField:
+    """
+    Общее поле направлений к игроку на сетке тайлов.
+
+    Один поиск в ширину от клетки игрока по свободным клеткам (8 соседей, диагональ только если обе прямые
+    клетки рядом свободны) записывает для каждой достигнутой клетки следующую клетку кратчайшего пути к игроку.
+    Враг идет из своей клетки в следующую клетку пути, поэтому обходит объекты и границы, а не упирается в них
+    и не проверяет столкновения со стеной каждый кадр.
+
+    Поле пересчитывается только когда игрок перешел в другую клетку или изменились препятствия
+    (CollisionGrid.version: срезанная трава, подгрузка областей). Занятыми считаются клетки, которые задевают
+    хитбоксы препятствий (CollisionGrid.blocked_grid). Клетка, занятая препятствием, получает следующую клетку,
+    но через нее путь не идет: враг, задевший край препятствия, выходит на свободную клетку.
+
+    Attributes:
+        rows (int): Количество строк сетки.
+        cols (int): Количество столбцов сетки.
+        obstacles (CollisionGrid): Препятствия уровня.
+        radius (int): Наибольшая длина пути в клетках.
+        blocked (bytearray): Занята ли клетка препятствием.
+        next_cell (array): Номер следующей клетки пути к игроку (NO_CELL - пути нет).
+        target (int): Клетка игрока, от которой построено поле.
+        version (int): Версия препятствий, по которой построена занятость клеток.
+        recomputes (int): Количество пересчетов поля.
+
+    Methods:
+        cell_at(pos): Возвращает номер клетки для мировых координат.
+        update(pos): Пересчитывает поле, если игрок сменил клетку или изменились препятствия.
+        direction(pos, speed): Возвращает направление шага к следующей клетке пути к игроку.
+    """
+    def __init__(self, rows, cols, obstacles, radius=FLOW_RADIUS):
+        self.rows = rows
+        self.cols = cols
+        self.obstacles = obstacles
+        self.radius = radius
+        self.blocked = bytearray(rows * cols)
+        self.next_cell = array('i', [NO_CELL]) * (rows * cols)
+        self.target = NO_CELL
+        self.version = None
+        self.recomputes = 0
+
+    def cell_at(self, pos):
+        col = int(pos[0]) // TILESIZE
+        row = int(pos[1]) // TILESIZE
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return NO_CELL
+
+    def update(self, pos):
+        """
+        Пересчитывает поле от клетки игрока, если она или препятствия изменились с прошлого расчета.
+
+        Parameters:
+            pos (tuple): Мировые координаты игрока.
+        """
+        blocked = self.obstacles.blocked_grid(self.rows, self.cols)
+        target = self.cell_at(pos)
+        version = self.obstacles.version
+        if target == self.target and version == self.version:
+            return
+
+        self.blocked = blocked
+        self.version = version
+        self.target = target
+        self.recomputes += 1
+        self.search()
+
+    def search(self):
+        """
+        Поиск в ширину от клетки игрока на глубину radius.
+        """
+        cols = self.cols
+        rows = self.rows
+        blocked = self.blocked
+        next_cell = self.next_cell = array('i', [NO_CELL]) * (rows * cols)
+        if self.target == NO_CELL:
+            return
+
+        next_cell[self.target] = self.target
+        frontier = deque([(self.target, 0)])
+        while frontier:
+            cell, depth = frontier.popleft()
+            if depth == self.radius:
+                continue
+            row, col = divmod(cell, cols)
+            for step_col, step_row in FLOW_NEIGHBOURS:
+                neighbour_row = row + step_row
+                neighbour_col = col + step_col
+                if not (0 <= neighbour_row < rows and 0 <= neighbour_col < cols):
+                    continue
+                neighbour = neighbour_row * cols + neighbour_col
+                if next_cell[neighbour] != NO_CELL:
+                    continue
+                # Диагональ не срезает угол препятствия
+                if step_col and step_row and (blocked[row * cols + neighbour_col]
+                                              or blocked[neighbour_row * cols + col]):
+                    continue
+                next_cell[neighbour] = cell
+                if not blocked[neighbour]:
+                    frontier.append((neighbour, depth + 1))
+
+    def direction(self, pos, speed):
+        """
+        Возвращает направление шага из клетки pos к следующей клетке пути.
+
+        Направление вдоль пути - шаг сетки (-1, 0 или 1 по каждой оси). При прямом шаге враг, смещенный поперек пути
+        от центра своей клетки, одновременно выравнивается к центру: иначе его хитбокс задевает препятствия
+        по бокам прохода шириной в одну клетку. Поперечная составляющая не больше offset / speed, поэтому
+        после нормализации враг сдвигается поперек не дальше центра и не качается вокруг него.
+
+        Parameters:
+            pos (tuple): Мировые координаты центра врага.
+            speed (int): Скорость врага (пикселей за шаг).
+
+        Returns:
+            tuple: (x, y) или None, если враг в клетке игрока, рядом с ней или пути нет
+                (тогда враг идет прямо к игроку).
+        """
+        cell = self.cell_at(pos)
+        if cell == NO_CELL:
+            return None
+        following = self.next_cell[cell]
+        if following == NO_CELL or following == self.target:
+            return None
+        row, col = divmod(cell, self.cols)
+        following_row, following_col = divmod(following, self.cols)
+        step_x = following_col - col
+        step_y = following_row - row
+        offset_x = col * TILESIZE + TILESIZE // 2 - pos[0]
+        offset_y = row * TILESIZE + TILESIZE // 2 - pos[1]
+        if not step_y and offset_y:
+            step_y = min(1, offset_y / speed) if offset_y > 0 else max(-1, offset_y / speed)
+        if not step_x and offset_x:
+            step_x = min(1, offset_x / speed) if offset_x > 0 else max(-1, offset_x / speed)
+        return step_x, step_y
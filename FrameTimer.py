@@ -0,0 +1,85 @@
+from time import perf_counter
+
+
+class FrameTimer:
+    """
+    Замер времени по фазам кадра.
+
+    Уровень оборачивает свои фазы (custom_draw, update, enemy_update, player_attack_logic, ui.display)
+    в timer.phase(имя); пока таймер выключен, обертка ничего не делает. Фазы могут быть вложенными (например,
+    весь кадр и его части). Время каждой фазы каждого кадра записывается в миллисекундах, report() считает
+    по ним среднее и процентили.
+
+    Пример:
+        with level.frame_timer.phase('update'):
+            level.visible_sprites.update()
+
+    Attributes:
+        enabled (bool): Записывать ли время.
+        samples (dict): Имя фазы -> список длительностей в миллисекундах (порядок фаз - порядок первого замера).
+        pending (str): Фаза, переданная в phase() и еще не начатая.
+        running (list): Стек начатых фаз: пары (имя, время начала).
+
+    Methods:
+        phase(name): Возвращает контекст для замера фазы.
+        reset(): Удаляет записанные замеры.
+        report(): Возвращает статистику по фазам.
+        format_report(): Возвращает статистику в виде текстовой таблицы.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.samples = {}
+        self.pending = None
+        self.running = []
+
+    def phase(self, name):
+        self.pending = name
+        return self
+
+    def __enter__(self):
+        if self.enabled:
+            self.running.append((self.pending, perf_counter()))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.enabled and self.running:
+            name, started = self.running.pop()
+            self.samples.setdefault(name, []).append((perf_counter() - started) * 1000)
+        return False
+
+    def reset(self):
+        self.samples = {}
+
+    @staticmethod
+    def percentile(values, percent):
+        """
+        Возвращает процентиль отсортированного списка методом ближайшего ранга.
+        """
+        index = max(0, -(-len(values) * percent // 100) - 1)
+        return values[int(index)]
+
+    def report(self):
+        """
+        Считает статистику по каждой фазе.
+
+        Returns:
+            dict: Имя фазы -> словарь count, mean, p50, p95, p99 (миллисекунды).
+        """
+        result = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            result[name] = {
+                'count': len(ordered),
+                'mean': sum(ordered) / len(ordered),
+                'p50': self.percentile(ordered, 50),
+                'p95': self.percentile(ordered, 95),
+                'p99': self.percentile(ordered, 99),
+            }
+        return result
+
+    def format_report(self):
+        lines = [f'{"фаза":<22}{"кадров":>8}{"mean":>10}{"p50":>10}{"p95":>10}{"p99":>10}  (мс)']
+        for name, stats in self.report().items():
+            lines.append(f'{name:<22}{stats["count"]:>8}{stats["mean"]:>10.3f}{stats["p50"]:>10.3f}'
+                         f'{stats["p95"]:>10.3f}{stats["p99"]:>10.3f}')
+        return '\n'.join(lines)
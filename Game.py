@@ -7,6 +7,9 @@ HEIGHT = 720
 FPS = 60
 TILESIZE = 64
 
+# Больше этого времени (мс) за один кадр не досчитывается, иначе после зависания симуляция не догонит время
+MAX_FRAME_TIME = 250
+
 
 class Game:
     """
@@ -17,33 +20,122 @@ class Game:
         Attributes:
             screen (pygame.Surface): Поверхность для отображения игры (окно игры).
             clock (pygame.time.Clock): Объект для контроля частоты кадров.
+            dirty_rects (bool): Обновлять на экране только изменившиеся области вместо всего окна.
+            render_fps (int): Частота отрисовки.
+            render (bool): Отрисовывать ли игру.
+            accumulator (float): Время (мс), накопленное с последнего шага симуляции.
+            overlay (PerfOverlay): Оверлей производительности (F3).
+            recorder (InputRecorder): Запись ввода (None, если не записывается).
+            replay (InputReplay): Воспроизводимая запись ввода (None, если играет игрок).
 
         Methods:
+            preload_assets(): Запускает фоновую загрузку изображений до создания игры.
+            simulate(steps): Выполняет шаги симуляции без отрисовки.
             run(): Запускает игровой цикл.
         """
-    def __init__(self):
+    def __init__(self, dirty_rects=False, streaming=False, render_fps=FPS, render=True, record_path=None,
+                 replay_path=None):
         """
        Инициализация класса Game.
 
        Метод инициализирует библиотеку Pygame, создает окно игры с указанными размерами,
        устанавливает заголовок окна и создает объект часов для контроля частоты кадров.
        Также создает объект уровня `Level`.
+
+       Parameters:
+           dirty_rects (bool): Режим грязных прямоугольников для слабых машин: пока камера стоит на месте,
+               в pygame.display.update передаются только изменившиеся области.
+           streaming (bool): Потоковая подгрузка карты: спрайты существуют только для областей вокруг игрока.
+           render_fps (int): Частота отрисовки. Симуляция всегда идет шагами SIM_STEP, поэтому на слабых
+               машинах частоту можно снизить без изменения игровой логики.
+           render (bool): Отрисовывать ли игру. Без отрисовки симуляция идет быстрее реального времени.
+           record_path (str): Файл, в который при выходе записывается ввод игрока и зерно random.
+           replay_path (str): Файл записи ввода, который воспроизводится вместо клавиатуры.
        """
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption('Пернатое Пробуждение: Попугай Принц и Потерянное Орлятко')
         self.clock = pygame.time.Clock()
 
-        self.level = Level()
+        self.dirty_rects = dirty_rects
+        self.render_fps = render_fps
+        self.render = render
+        self.accumulator = 0.0
+
+        # Запись или воспроизведение ввода; зерно random фиксируется до создания уровня
+        self.record_path = record_path
+        self.recorder = InputRecorder() if record_path else None
+        self.replay = InputReplay(replay_path) if replay_path else None
+
+        self.level = Level(dirty_rects, streaming)
+        if self.recorder is not None:
+            self.level.player.input_source = self.recorder.read
+        elif self.replay is not None:
+            self.level.player.input_source = self.replay.read
+        self.overlay = PerfOverlay()
+
+    @staticmethod
+    def preload_assets():
+        """
+        Запускает фоновое декодирование всех изображений, которые загружает Game() (уровень, игрок,
+        оружие, частицы, интерфейс и карта). Вызывается после создания окна, например перед
+        вступительными экранами; готовые изображения подготавливаются через assets.pump().
+        """
+        assets.preload(Level.asset_paths() + Player.asset_paths() + AnimationPlayer.asset_paths() + UI.asset_paths())
+        # Кадры оружия запрашиваются как выгружаемые
+        assets.preload(Weapon.asset_paths(), evictable=True)
+        assets.preload([FLOOR_IMAGE], alpha=False)
+
+    def simulate(self, steps):
+        """
+        Выполняет заданное количество шагов симуляции без отрисовки и ожидания, быстрее реального времени.
+
+        Parameters:
+            steps (int): Количество шагов SIM_STEP.
+        """
+        for _ in range(steps):
+            self.level.update()
 
     def run(self):
+        """
+        Игровой цикл с фиксированным шагом: прошедшее время копится в accumulator, и уровень обновляется
+        шагами SIM_STEP столько раз, сколько их поместилось. Затем кадр рисуется с интерполяцией
+        на оставшуюся долю шага.
+        """
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    if self.recorder is not None:
+                        self.recorder.save(self.record_path)
                     pygame.quit()
                     sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.overlay.toggle(self.level)
+
+            if not self.render:
+                self.level.update()
+                continue
+
+            frame_time = self.clock.tick(self.render_fps)
+            self.accumulator += min(frame_time, MAX_FRAME_TIME)
+            while self.accumulator >= SIM_STEP:
+                self.level.update()
+                self.accumulator -= SIM_STEP
+            alpha = self.accumulator / SIM_STEP
 
-            self.screen.fill('black')
-            self.level.run()
-            pygame.display.update()
-            self.clock.tick(FPS)
\ No newline at end of file
+            if self.dirty_rects:
+                # Камера сама очищает и перерисовывает изменившиеся области
+                self.level.draw(alpha)
+                changed_rects = self.level.changed_rects()
+                if self.overlay.visible:
+                    self.overlay.record(frame_time, self.level)
+                    self.overlay.draw(self.screen, self.level)
+                    changed_rects = changed_rects + [self.overlay.rect]
+                pygame.display.update(changed_rects)
+            else:
+                self.screen.fill('black')
+                self.level.draw(alpha)
+                if self.overlay.visible:
+                    self.overlay.record(frame_time, self.level)
+                    self.overlay.draw(self.screen, self.level)
+                pygame.display.update()
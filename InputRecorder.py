@@ -0,0 +1,112 @@
+import random
+import struct
+import pygame
+
+# Клавиши управления в порядке битов маски ввода
+INPUT_KEYS = (pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d, pygame.K_e, pygame.K_q, pygame.K_r, pygame.K_TAB)
+INPUT_MAGIC = b'MGINPUT1'
+
+
+class InputState:
+    """
+    Состояние клавиш управления за один шаг симуляции, упакованное в байт-маску.
+
+    Поддерживает обращение keys[pygame.K_w], как результат pygame.key.get_pressed, поэтому Player.input
+    работает с ним без изменений.
+
+    Attributes:
+        mask (int): Биты нажатых клавиш в порядке INPUT_KEYS.
+    """
+    bits = {key: 1 << index for index, key in enumerate(INPUT_KEYS)}
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    @classmethod
+    def from_pressed(cls, pressed):
+        mask = 0
+        for key, bit in cls.bits.items():
+            if pressed[key]:
+                mask |= bit
+        return cls(mask)
+
+    def __getitem__(self, key):
+        return bool(self.mask & self.bits.get(key, 0))
+
+
+class InputRecorder:
+    """
+    Запись ввода игрока для воспроизводимых прогонов.
+
+    При создании фиксирует зерно модуля random (выбор травы при создании карты, листья, огонь магии),
+    поэтому его нужно создать до уровня. Затем подставляется вместо pygame.key.get_pressed в Player.input
+    и записывает по одному байту-маске клавиш на каждый шаг симуляции.
+
+    Формат файла: INPUT_MAGIC, зерно (uint64), количество шагов (uint32), затем маски по байту на шаг.
+
+    Attributes:
+        seed (int): Зерно random для сессии.
+        masks (bytearray): Маски ввода по шагам.
+
+    Methods:
+        read(): Читает клавиатуру, записывает маску и возвращает InputState для Player.input.
+        save(path): Записывает сессию в файл.
+    """
+    def __init__(self, seed=None):
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        random.seed(self.seed)
+        self.masks = bytearray()
+
+    def read(self):
+        state = InputState.from_pressed(pygame.key.get_pressed())
+        self.masks.append(state.mask)
+        return state
+
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(INPUT_MAGIC)
+            file.write(struct.pack('<QI', self.seed, len(self.masks)))
+            file.write(self.masks)
+
+
+class InputReplay:
+    """
+    Воспроизведение записанного ввода.
+
+    Загружает файл InputRecorder, фиксирует то же зерно random (до создания уровня) и подставляется вместо
+    pygame.key.get_pressed в Player.input, отдавая записанные маски по одной на шаг. После конца записи
+    клавиши считаются отпущенными.
+
+    Attributes:
+        seed (int): Зерно random записанной сессии.
+        masks (bytes): Маски ввода по шагам.
+        tick (int): Номер следующего шага.
+
+    Methods:
+        read(): Возвращает InputState следующего шага.
+        finished: Закончилась ли запись.
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        if data[:len(INPUT_MAGIC)] != INPUT_MAGIC:
+            raise ValueError(f'{path} не является записью ввода')
+        self.seed, count = struct.unpack_from('<QI', data, len(INPUT_MAGIC))
+        start = len(INPUT_MAGIC) + struct.calcsize('<QI')
+        self.masks = data[start:start + count]
+        self.tick = 0
+        random.seed(self.seed)
+
+    def __len__(self):
+        return len(self.masks)
+
+    @property
+    def finished(self):
+        return self.tick >= len(self.masks)
+
+    def read(self):
+        if self.finished:
+            return InputState()
+        state = InputState(self.masks[self.tick])
+        self.tick += 1
+        return state
@@ -1,7 +1,6 @@
-from csv import reader
 import os
 import pygame
-from random import choice, randint
+from random import randint, randrange
 
 # Настройки игры
 WIDTH = 1280
@@ -9,10 +8,43 @@ HEIGHT = 720
 FPS = 60
 TILESIZE = 64
 
+# Изображения монстров: папка и имена файлов для каждой анимации
+monster_graphics = {
+    'squid': {
+        'idle_images': ('graphics/monsters/squid/idle', ['1_монстр_idle.png', '2_монстр_idle.png',
+                                                         '3_монстр_idle.png', '4_монстр_idle.png']),
+        'move_images': ('graphics/monsters/squid/move', ['0_монстр_move.png', '1_монстр_move.png',
+                                                         '2_монстр_move.png', '3_монстр_move.png']),
+        'idle_attack': ('graphics/monsters/squid/attack', ['4_1.png']),
+    },
+    'raccoon': {
+        'idle_images': ('graphics/monsters/raccoon/idle', ['as.png', 'as_1.png', 'as_2.png', 'as_3.png', 'as_4.png',
+                                                           'as_5.png']),
+        'move_images': ('graphics/monsters/raccoon/move', ['zx.png', 'zx_1.png', 'zx_2.png', 'zx_3.png', 'zx_4.png']),
+        'idle_attack': ('graphics/monsters/raccoon/attack', ['qw.png', 'qw_1.png', 'qw_2.png', 'qw_3.png']),
+    },
+}
+
+# Слои карты: имя слоя и CSV-файл (порядок слоев - порядок создания спрайтов)
+level_layers = {
+    'Граница': '12.csv',
+    'grass': 'Grass.csv',
+    'object': 'Object.csv',
+    'entities': 'map_Entities.csv',
+}
+
+# Изображения тайлов: папка и имена файлов
+tile_graphics = {
+    'grass': ('graphics/grass', ['grass_1.png', 'grass_2.png', 'grass_3.png']),
+    'object': ('graphics/objects', ['0.png', '01.png', '02.png', '03.png', '04.png', '05.png', '06.png', '07.png',
+                                    '08.png', '09.png', '10.png', '11.png', '12.png', '13.png', '14.png', '15.png',
+                                    '16.png', '17.png', '18.png', '19.png', '20.png']),
+}
+
 
 class Level:
 
-    def __init__(self):
+    def __init__(self, dirty_rects=False, streaming=False):
         """
              Класс уровня игры.
 
@@ -23,17 +55,30 @@ class Level:
                  player (Player): Объект игрока на уровне.
                  display_surface (pygame.Surface): Поверхность для отображения игры.
                  visible_sprites (Camera): Камера для отображения видимых спрайтов на экране.
-                 obstacle_sprites (pygame.sprite.Group): Группа препятствий для обнаружения столкновений.
+                 obstacle_sprites (CollisionGrid): Группа препятствий, разложенная по ячейкам сетки для столкновений.
                  attack_sprites (pygame.sprite.Group): Группа спрайтов атаки для обработки столкновений.
-                 attackable_sprites (pygame.sprite.Group): Группа спрайтов, которых можно атаковать.
+                 attackable_sprites (SpatialHash): Группа спрайтов, которых можно атаковать, с поиском по области.
                  current_attack (Weapon): Текущая атака игрока.
+                 level_map (MapCompiler): Скомпилированные слои карты (сетки значений ячеек).
+                 tile_layers (dict): Слой карты -> TileLayer со статичными тайлами (граница, трава, объекты).
+                 flow_field (FlowField): Поле направлений к игроку, общее для всех врагов.
+                 line_of_sight (LineOfSight): Проверка прямой видимости игрока врагами с кэшем по парам клеток.
+                 streaming (bool): Создавать спрайты только для областей карты вокруг игрока.
+                 streamer (WorldStreamer): Подгрузка областей карты (None, если потоковый режим выключен).
+                 frame_timer (FrameTimer): Замер времени фаз кадра (по умолчанию выключен).
                  ui (UI): Объект интерфейса уровня.
                  animation_player (AnimationPlayer): Объект управления анимациями.
                  magic_player (MagicPlayer): Объект управления магическими способностями игрока.
+             Parameters:
+                 dirty_rects (bool): Включить режим грязных прямоугольников в камере.
+                 streaming (bool): Включить потоковую подгрузку карты по областям вокруг игрока.
+
              Methods:
-                 import_csv_layout(path): Статический метод для импорта данных уровня из CSV-файла.
                  import_images(image_names, folder_path): Статический метод для импорта изображений.
+                 asset_paths(): Статический метод, возвращающий пути ко всем изображениям уровня.
                  create_map(): Создает карту уровня и размещает на ней объекты и спрайты.
+                 create_player(): Создает игрока.
+                 create_cell(style, row_index, col_index, col, monster_name): Создает спрайты одной ячейки карты.
                  create_attack(): Создает атаку игрока.
                  create_magic(style, strength, cost): Создает магическую способность игрока.
                  destroy_attack(): Уничтожает текущую атаку игрока.
@@ -43,23 +88,38 @@ class Level:
                  show_liza2_2(): Отображает спрайт с изображением 'лиза2 (2).png' на уровне.
                  show_liza2_3(): Отображает спрайт с изображением 'лиза2 (3).png' на уровне.
                  trigger_death_particles(pos, particle_type): Активирует анимацию смерти врага и создает частицы.
-                 run(): Выполняет обновление и отрисовку всех спрайтов и элементов уровня.
+                 changed_rects(): Возвращает области экрана, изменившиеся в последнем кадре.
+                 update(): Выполняет один шаг симуляции.
+                 draw(alpha): Отрисовывает уровень с интерполяцией положения спрайтов.
+                 run(): Выполняет отрисовку и один шаг симуляции (кадр без фиксированного шага).
              """
 
+        # Время симуляции отсчитывается от создания уровня
+        sim_clock.reset()
+        # Реестр спрайтов хранит спрайты только текущего уровня
+        sprite_registry.reset()
+
         # Поверхность для отображения игры
         self.player = None
         self.display_surface = pygame.display.get_surface()
 
         # Камера для отображения видимых спрайтов
-        self.visible_sprites = Camera()
+        self.visible_sprites = Camera(dirty_rects)
 
-        # Группа препятствий для обнаружения столкновений
-        self.obstacle_sprites = pygame.sprite.Group()
+        # Группа препятствий для обнаружения столкновений, разложенная по сетке тайлов
+        self.obstacle_sprites = CollisionGrid()
 
         # атака объектов
         self.current_attack = None
         self.attack_sprites = pygame.sprite.Group()
-        self.attackable_sprites = pygame.sprite.Group()
+        self.attackable_sprites = SpatialHash()
+
+        # Потоковая подгрузка областей карты вокруг игрока
+        self.streaming = streaming
+        self.streamer = None
+
+        # Замер времени фаз кадра (включается бенчмарком)
+        self.frame_timer = FrameTimer()
 
         # Создание карты уровня
         self.create_map()
@@ -67,7 +127,7 @@ class Level:
         # интерфейс
         self.ui = UI()
 
-        self.animation_player = AnimationPlayer()
+        self.animation_player = AnimationPlayer(self.visible_sprites.particles)
 
         self.magic_player = MagicPlayer(self.animation_player)
 
@@ -77,25 +137,7 @@ class Level:
         self.change_image_coordinates = (2873, 2709)
 
         # Время последней смены изображения
-        self.last_image_change_time = pygame.time.get_ticks()
-
-    @staticmethod
-    def import_csv_layout(path):
-        """
-       Статический метод для импорта данных уровня из CSV-файла.
-
-       Parameters:
-           path (str): Путь к CSV-файлу с данными уровня.
-
-       Returns:
-           list: Список списков, представляющих данные уровня.
-       """
-        terrain_map = []
-        with open(path) as level_map:
-            layout = reader(level_map, delimiter=',')
-            for row in layout:
-                terrain_map.append(list(row))
-            return terrain_map
+        self.last_image_change_time = sim_clock.ticks()
 
     @staticmethod
     def import_images(image_names, folder_path):
@@ -112,121 +154,135 @@ class Level:
         surface_list = []
         for name in image_names:
             image_path = os.path.join(folder_path, name)
-            image_surf = pygame.image.load(image_path).convert_alpha()
+            image_surf = assets.image(image_path)
             surface_list.append(image_surf)
         return surface_list
 
+    @staticmethod
+    def asset_paths():
+        """
+        Статический метод, возвращающий пути ко всем изображениям монстров и тайлов уровня.
+
+        Returns:
+            list: Пути к файлам изображений (для фоновой предзагрузки).
+        """
+        folders = [folder for animations in monster_graphics.values() for folder in animations.values()]
+        folders += list(tile_graphics.values())
+        return [os.path.join(folder_path, name) for folder_path, image_names in folders for name in image_names]
+
     def create_map(self):
         """
         Создает карту уровня и размещает на ней объекты и спрайты.
+        В режиме потоковой подгрузки создается только игрок, остальные спрайты создает WorldStreamer
+        для областей вокруг него.
         """
-        # Импорт данных уровня
-        layouts = {
-            'Граница': self.import_csv_layout('12.csv'),
-            'grass': self.import_csv_layout('Grass.csv'),
-            'object': self.import_csv_layout('Object.csv'),
-            'entities': self.import_csv_layout('map_Entities.csv')
-        }
-
-        squid_graphics = {
-            'idle_images': self.import_images(['1_монстр_idle.png', '2_монстр_idle.png', '3_монстр_idle.png',
-                                               '4_монстр_idle.png'], 'graphics/monsters/squid/idle'),
-            'move_images': self.import_images(['0_монстр_move.png', '1_монстр_move.png', '2_монстр_move.png',
-                                               '3_монстр_move.png'], 'graphics/monsters/squid/move'),
-            'idle_attack': self.import_images(['4_1.png'], 'graphics/monsters/squid/attack')
-        }
+        # Импорт данных уровня из скомпилированной карты (CSV разбирается только при их изменении)
+        self.level_map = MapCompiler(level_layers).load()
+        level_map = self.level_map
 
-        raccoon_graphics = {
-            'idle_images': self.import_images(['as.png', 'as_1.png', 'as_2.png', 'as_3.png', 'as_4.png', 'as_5.png'],
-                                              'graphics/monsters/raccoon/idle'),
-            'move_images': self.import_images(['zx.png', 'zx_1.png', 'zx_2.png', 'zx_3.png', 'zx_4.png'],
-                                              'graphics/monsters/raccoon/move'),
-            'idle_attack': self.import_images(['qw.png', 'qw_1.png', 'qw_2.png', 'qw_3.png'],
-                                              'graphics/monsters/raccoon/attack')
+        self.squid_graphics = {animation: self.import_images(image_names, folder_path)
+                               for animation, (folder_path, image_names) in monster_graphics['squid'].items()}
 
-        }
+        self.raccoon_graphics = {animation: self.import_images(image_names, folder_path)
+                                 for animation, (folder_path, image_names) in monster_graphics['raccoon'].items()}
 
         # Импорт изображений
-        graphics = {
-            'grass': self.import_images(['grass_1.png', 'grass_2.png', 'grass_3.png'], 'graphics/grass'),
-            'object': self.import_images(['0.png', '01.png', '02.png', '03.png', '04.png', '05.png', '06.png',
-                                          '07.png', '08.png', '09.png', '10.png', '11.png', '12.png', '13.png',
-                                          '14.png', '15.png', '16.png', '17.png', '18.png', '19.png', '20.png'],
-                                         'graphics/objects')
+        self.graphics = {style: self.import_images(image_names, folder_path)
+                         for style, (folder_path, image_names) in tile_graphics.items()}
+
+        # Поле направлений к игроку, по которому враги обходят препятствия
+        self.flow_field = FlowField(level_map.rows, level_map.cols, self.obstacle_sprites)
+        # Враги замечают игрока только при прямой видимости
+        self.line_of_sight = LineOfSight(level_map.rows, level_map.cols, self.obstacle_sprites)
+
+        # Статичные тайлы хранятся массивами по слоям, а не спрайтами; граница невидима и только мешает проходу
+        self.tile_layers = {
+            'Граница': TileLayer('невидимость', [self.obstacle_sprites], hitbox_top=5),
+            'grass': TileLayer('grass', [self.visible_sprites, self.obstacle_sprites, self.attackable_sprites],
+                               self.graphics['grass']),
+            'object': TileLayer('object', [self.visible_sprites, self.obstacle_sprites], self.graphics['object']),
         }
 
+        if self.streaming:
+            self.create_player()
+            self.streamer = WorldStreamer(level_map, self.create_cell)
+            self.streamer.update(self.player.rect.center)
+            return
+
         monster_name = None  # Инициализация переменной monster_name
 
-        for style, layout in layouts.items():
-            for row_index, row in enumerate(layout):
-                for col_index, col in enumerate(row):
-                    if col != '-1':
-                        x = col_index * TILESIZE
-                        y = row_index * TILESIZE
-
-                        # Создание спрайтов в зависимости от стиля
-                        if style == 'Граница':
-                            Tile((x, y), [self.obstacle_sprites], 'невидимость')
-                        elif style == 'grass':
-                            random_grass_image = choice(graphics['grass'])
-                            tile = Tile(
-                                (x, y),
-                                [self.visible_sprites, self.obstacle_sprites, self.attackable_sprites],
-                                'grass',
-                                random_grass_image
-                            )
-                            tile.rect.topleft = (x, y)
-                            tile.hitbox.topleft = (x, y)
-                        elif style == 'object':
-                            object_index = int(col)
-                            if object_index < len(graphics['object']):
-                                object_image = graphics['object'][object_index]
-
-                                tile = Tile((x, y - 65),
-                                            [self.visible_sprites, self.obstacle_sprites], 'object', object_image)
-                                tile.rect.topleft = (x, y - 65)
-                                tile.hitbox.topleft = (x, y - 65)
-
-                        if style == 'entities':
-                            if col == '394':
-                                # Создание игрока
-                                self.player = Player(
-                                    (735, 250),
-                                    (self.visible_sprites,),
-                                    self.obstacle_sprites,
-                                    self.create_attack,
-                                    self.destroy_attack,
-                                    self.create_magic)
-                            elif col == '392':
-                                monster_name = 'raccoon'
-                            else:
-                                monster_name = 'squid'
-
-                            if monster_name:
-                                if monster_name == 'squid':
-                                    Enemy(
-                                        monster_name,
-                                        (x, y),
-                                        [self.visible_sprites, self.attackable_sprites],
-                                        squid_graphics['idle_images'],
-                                        squid_graphics['move_images'],
-                                        squid_graphics['idle_attack'],
-                                        self.obstacle_sprites,
-                                        self.damage_player,
-                                        self.trigger_death_particles
-                                    )
-                                elif monster_name == 'raccoon':
-                                    Enemy(
-                                        monster_name,
-                                        (x, y),
-                                        [self.visible_sprites, self.attackable_sprites],
-                                        raccoon_graphics['idle_images'],
-                                        raccoon_graphics['move_images'],
-                                        raccoon_graphics['idle_attack'],
-                                        self.obstacle_sprites,
-                                        self.damage_player,
-                                        self.trigger_death_particles
-                                    )
+        for style in level_map.grids:
+            for row_index, col_index, col in level_map.cells(style):
+                if style == 'entities':
+                    if col == 392:
+                        monster_name = 'raccoon'
+                    elif col != 394:
+                        monster_name = 'squid'
+                self.create_cell(style, row_index, col_index, col, monster_name)
+
+    def create_player(self):
+        """
+        Создает игрока.
+        """
+        self.player = Player(
+            (735, 250),
+            (self.visible_sprites,),
+            self.obstacle_sprites,
+            self.create_attack,
+            self.destroy_attack,
+            self.create_magic)
+
+    def create_cell(self, style, row_index, col_index, col, monster_name=None):
+        """
+        Создает тайлы и спрайты одной непустой ячейки карты.
+
+        Parameters:
+            style (str): Слой карты ('Граница', 'grass', 'object' или 'entities').
+            row_index (int): Строка ячейки.
+            col_index (int): Столбец ячейки.
+            col (int): Значение ячейки.
+            monster_name (str): Монстр, который появляется в ячейке сущностей.
+
+        Returns:
+            list: Созданные тайлы (Tile) и спрайты (кроме игрока).
+        """
+        x = col_index * TILESIZE
+        y = row_index * TILESIZE
+        graphics = self.graphics
+        sprites = []
+
+        # Создание тайлов в зависимости от стиля
+        if style == 'Граница':
+            sprites.append(self.tile_layers['Граница'].add(x, y))
+        elif style == 'grass':
+            random_grass_index = randrange(len(graphics['grass']))
+            sprites.append(self.tile_layers['grass'].add(x, y, random_grass_index))
+        elif style == 'object':
+            object_index = col
+            if object_index < len(graphics['object']):
+                sprites.append(self.tile_layers['object'].add(x, y - 65, object_index))
+
+        if style == 'entities':
+            if col == 394 and self.player is None:
+                # Создание игрока
+                self.create_player()
+
+            if monster_name:
+                monster_graphics_set = self.squid_graphics if monster_name == 'squid' else self.raccoon_graphics
+                sprites.append(Enemy(
+                    monster_name,
+                    (x, y),
+                    [self.visible_sprites, self.attackable_sprites],
+                    monster_graphics_set['idle_images'],
+                    monster_graphics_set['move_images'],
+                    monster_graphics_set['idle_attack'],
+                    self.obstacle_sprites,
+                    self.damage_player,
+                    self.trigger_death_particles,
+                    self.flow_field,
+                    self.line_of_sight
+                ))
+        return sprites
 
     def create_attack(self):
         """
@@ -263,7 +319,7 @@ class Level:
         """
         if self.attack_sprites:
             for attack_sprite in self.attack_sprites:
-                collections_sprites = pygame.sprite.spritecollide(attack_sprite, self.attackable_sprites, False)
+                collections_sprites = self.attackable_sprites.query(attack_sprite.rect)
                 if collections_sprites:
                     for target_sprite in collections_sprites:
                         if target_sprite.sprite_type == 'grass':
@@ -275,7 +331,7 @@ class Level:
                         else:
                             target_sprite.get_damage(self.player, attack_sprite.sprite_type)
 
-    def damage_player(self, amount):
+    def damage_player(self, amount, attack_type):
         """
        Наносит урон игроку и обрабатывает его уязвимость.
 
@@ -286,20 +342,20 @@ class Level:
         if self.player.vulnerable:
             self.player.Wingchest -= amount
             self.player.vulnerable = False
-            self.player.hit_time = pygame.time.get_ticks()
+            self.player.hit_time = sim_clock.ticks()
             self.animation_player.create_grass_particles(self.player.rect.center, [self.visible_sprites])
 
     def remove_liza1(self):
-        for sprite in self.visible_sprites:
-            if isinstance(sprite, CustomImageSprite) and sprite.image_name == 'лиза1.png':
+        for sprite in sprite_registry.named('лиза1.png', self.visible_sprites):
+            if isinstance(sprite, CustomImageSprite):
                 if sprite.rect.topleft == self.change_image_coordinates:
                     sprite.kill()
                     self.show_liza2()  # Показываем liza2 сразу после удаления liza1
-                    self.last_image_change_time = pygame.time.get_ticks()  # Обновляем время после удаления
+                    self.last_image_change_time = sim_clock.ticks()  # Обновляем время после удаления
 
     def remove_liza2(self):
-        for sprite in self.visible_sprites:
-            if isinstance(sprite, CustomImageSprite) and sprite.image_name == 'лиза2.png':
+        for sprite in sprite_registry.named('лиза2.png', self.visible_sprites):
+            if isinstance(sprite, CustomImageSprite):
                 sprite.kill()
 
     def show_liza1(self):
@@ -318,14 +374,55 @@ class Level:
        """
         self.animation_player.create_particles(particle_type, pos, self.visible_sprites)
 
-    def run(self):
-        self.visible_sprites.custom_draw(self.player)
-        self.visible_sprites.update()
-        self.visible_sprites.enemy_update(self.player)
-        self.player_attack_logic()
-        self.ui.display(self.player)
-        current_time = pygame.time.get_ticks()
+    def changed_rects(self):
+        """
+        Возвращает области экрана, изменившиеся в последнем кадре.
+
+        Returns:
+            list: Прямоугольники камеры (спрайты, частицы) и интерфейса для pygame.display.update.
+        """
+        return self.visible_sprites.dirty_rects + self.ui.dirty_rects
+
+    def update(self):
+        """
+        Выполняет один шаг симуляции длительностью SIM_STEP: сдвигает часы симуляции, обновляет спрайты,
+        поле направлений и решения врагов, атаки игрока и таймер смены изображения.
+        """
+        timer = self.frame_timer
+        sim_clock.advance()
+        with timer.phase('update'):
+            self.visible_sprites.snapshot()
+            if self.streamer is not None:
+                self.streamer.update(self.player.rect.center)
+            self.visible_sprites.update()
+        with timer.phase('enemy_update'):
+            self.flow_field.update(self.player.hitbox.center)
+            self.visible_sprites.enemy_update(self.player)
+        with timer.phase('player_attack_logic'):
+            self.attackable_sprites.refresh()
+            self.player_attack_logic()
+        current_time = sim_clock.ticks()
         if current_time - self.last_image_change_time >= self.change_image_time:
             self.remove_liza1()
             self.show_liza2()
-            self.last_image_change_time = current_time
\ No newline at end of file
+            self.last_image_change_time = current_time
+
+    def draw(self, alpha=1.0):
+        """
+        Отрисовывает уровень и интерфейс.
+
+        Parameters:
+            alpha (float): Доля шага симуляции, прошедшая после последнего update (0..1). Подвижные спрайты
+                рисуются между положениями до и после последнего шага.
+        """
+        with self.frame_timer.phase('custom_draw'):
+            self.visible_sprites.custom_draw(self.player, alpha)
+        with self.frame_timer.phase('ui.display'):
+            self.ui.display(self.player)
+
+    def run(self):
+        with self.frame_timer.phase('custom_draw'):
+            self.visible_sprites.custom_draw(self.player)
+        self.update()
+        with self.frame_timer.phase('ui.display'):
+            self.ui.display(self.player)
@@ -0,0 +1,139 @@
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Наибольшее количество запомненных пар клеток (при переполнении кэш очищается)
+SIGHT_CACHE_LIMIT = 65536
+NO_CELL = -1
+
+
+class LineOfSight:
+    """
+    Проверка прямой видимости между клетками сетки тайлов с кэшем.
+
+    Луч идет от центра клетки врага к центру клетки игрока и проходит все клетки, которые он пересекает
+    (DDA по сетке, целочисленный). Видимость закрывают клетки, занятые препятствиями (граница, объекты, трава,
+    CollisionGrid.blocked_grid); при проходе луча точно через угол видимость закрывает любая из двух клеток
+    у угла. Клетки врага и игрока не проверяются.
+
+    Результат зависит только от пары клеток, поэтому запоминается по паре (видимость симметрична) и для сотен врагов
+    каждый шаг почти всегда берется из кэша. Кэш очищается, когда изменились препятствия (CollisionGrid.version:
+    срезанная трава, подгрузка областей).
+
+    Attributes:
+        rows (int): Количество строк сетки.
+        cols (int): Количество столбцов сетки.
+        obstacles (CollisionGrid): Препятствия уровня.
+        blocked (bytearray): Занятость клеток препятствиями.
+        version (int): Версия препятствий, для которой заполнен кэш.
+        cache (dict): Пара клеток -> видна ли одна из другой.
+        hits (int): Количество ответов из кэша.
+        misses (int): Количество проверок лучом.
+
+    Methods:
+        cell_at(pos): Возвращает номер клетки для мировых координат.
+        visible(source, target): Проверяет прямую видимость между двумя точками мира.
+        trace(start, end): Пускает луч между клетками.
+    """
+    def __init__(self, rows, cols, obstacles):
+        self.rows = rows
+        self.cols = cols
+        self.obstacles = obstacles
+        self.blocked = None
+        self.version = None
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def cell_at(self, pos):
+        col = int(pos[0]) // TILESIZE
+        row = int(pos[1]) // TILESIZE
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return NO_CELL
+
+    def visible(self, source, target):
+        """
+        Проверяет, видна ли точка target из точки source.
+
+        Parameters:
+            source (tuple): Мировые координаты (центр врага).
+            target (tuple): Мировые координаты (центр игрока).
+
+        Returns:
+            bool: True, если между клетками точек нет препятствий (за пределами карты - всегда True).
+        """
+        start = self.cell_at(source)
+        end = self.cell_at(target)
+        if start == NO_CELL or end == NO_CELL:
+            return True
+
+        if self.obstacles.pending or self.obstacles.version != self.version:
+            self.blocked = self.obstacles.blocked_grid(self.rows, self.cols)
+            if self.obstacles.version != self.version:
+                self.version = self.obstacles.version
+                self.cache.clear()
+
+        key = start * len(self.blocked) + end if start < end else end * len(self.blocked) + start
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        if len(self.cache) >= SIGHT_CACHE_LIMIT:
+            self.cache.clear()
+        result = self.cache[key] = self.trace(start, end)
+        return result
+
+    def trace(self, start, end):
+        """
+        Пускает луч от центра клетки start к центру клетки end.
+
+        Луч пересекает |dc| вертикальных и |dr| горизонтальных границ клеток. Граница столбца номер k
+        пересекается в момент (2k + 1) / (2|dc|), строки номер m - в момент (2m + 1) / (2|dr|); моменты
+        сравниваются в целых числах, поэтому проход через угол определяется точно.
+
+        Parameters:
+            start (int): Номер клетки начала.
+            end (int): Номер клетки конца.
+
+        Returns:
+            bool: True, если луч не проходит через занятые клетки.
+        """
+        cols = self.cols
+        blocked = self.blocked
+        row, col = divmod(start, cols)
+        end_row, end_col = divmod(end, cols)
+        span_col = abs(end_col - col)
+        span_row = abs(end_row - row)
+        step_col = 1 if end_col > col else -1
+        step_row = 1 if end_row > row else -1
+
+        crossed_col = crossed_row = 0
+        while crossed_col < span_col or crossed_row < span_row:
+            moment_col = (2 * crossed_col + 1) * span_row
+            moment_row = (2 * crossed_row + 1) * span_col
+            if crossed_col < span_col and (crossed_row == span_row or moment_col < moment_row):
+                col += step_col
+                crossed_col += 1
+            elif crossed_row < span_row and (crossed_col == span_col or moment_row < moment_col):
+                row += step_row
+                crossed_row += 1
+            else:
+                # Луч проходит точно через угол: его закрывает любая из двух клеток у угла
+                if blocked[row * cols + col + step_col] or blocked[(row + step_row) * cols + col]:
+                    return False
+                col += step_col
+                row += step_row
+                crossed_col += 1
+                crossed_row += 1
+
+            cell = row * cols + col
+            if cell == end:
+                return True
+            if blocked[cell]:
+                return False
+        return True
@@ -0,0 +1,203 @@
+import os
+import struct
+from array import array
+from csv import reader
+
+# Настройки скомпилированной карты
+MAP_CACHE = 'map.bin'
+MAP_MAGIC = b'MGMAP001'
+EMPTY_CELL = -1
+
+
+class MapCompiler:
+    """
+    Компилятор слоев карты из CSV в компактный двоичный файл.
+
+    Каждый CSV-слой (граница, трава, объекты, сущности) переводится в сетку int16 и список непустых ячеек.
+    Результат кэшируется в MAP_CACHE и пересобирается, только если mtime или размер одного из CSV изменился,
+    поэтому при обычном запуске CSV не разбирается, а Level.create_map обходит только непустые ячейки.
+    Кэш записывается во временный файл и подменяется целиком; поврежденный или обрезанный кэш считается
+    устаревшим, а если кэш не удалось записать (например, папка только для чтения), карта просто не кэшируется.
+
+    Формат файла: MAP_MAGIC, строки и столбцы (uint16), количество слоев (uint16), затем для каждого слоя:
+    длина имени (uint16), имя в UTF-8, mtime (double) и размер (uint64) исходного CSV, количество непустых
+    ячеек (uint32), индексы непустых ячеек (int32), сетка rows * cols значений (int16).
+
+    Attributes:
+        sources (dict): Имя слоя -> путь к CSV-файлу (порядок слоев сохраняется).
+        cache_path (str): Путь к файлу скомпилированной карты.
+        rows (int): Количество строк карты.
+        cols (int): Количество столбцов карты.
+        grids (dict): Имя слоя -> array('h') значений ячеек построчно.
+        filled (dict): Имя слоя -> array('i') индексов непустых ячеек.
+
+    Methods:
+        load(): Загружает карту из кэша или компилирует ее заново.
+        cells(layer): Перебирает непустые ячейки слоя.
+        value(layer, row, col): Возвращает значение ячейки.
+    """
+    def __init__(self, sources, cache_path=MAP_CACHE):
+        self.sources = sources
+        self.cache_path = cache_path
+        self.rows = 0
+        self.cols = 0
+        self.grids = {}
+        self.filled = {}
+
+    def source_stats(self):
+        return {name: (os.stat(path).st_mtime, os.stat(path).st_size) for name, path in self.sources.items()}
+
+    def load(self):
+        """
+        Загружает карту из кэша, если он соответствует исходным CSV, иначе компилирует и сохраняет кэш.
+
+        Returns:
+            MapCompiler: Этот же объект с заполненными сетками.
+        """
+        stats = self.source_stats()
+        if not self.read_cache(stats):
+            self.compile()
+            self.write_cache(stats)
+        return self
+
+    def compile(self):
+        """
+        Разбирает CSV-слои в сетки int16 и списки непустых ячеек.
+        """
+        layouts = {}
+        for name, path in self.sources.items():
+            with open(path) as level_map:
+                layouts[name] = [[int(cell) for cell in row] for row in reader(level_map, delimiter=',')]
+
+        self.rows = max(len(layout) for layout in layouts.values())
+        self.cols = max(len(row) for layout in layouts.values() for row in layout)
+        for name, layout in layouts.items():
+            grid = array('h', [EMPTY_CELL]) * (self.rows * self.cols)
+            for row_index, row in enumerate(layout):
+                for col_index, cell in enumerate(row):
+                    if not -32768 <= cell <= 32767:
+                        raise ValueError(f'Значение {cell} в слое {name} не помещается в int16')
+                    grid[row_index * self.cols + col_index] = cell
+            self.grids[name] = grid
+            self.filled[name] = array('i', [index for index, cell in enumerate(grid) if cell != EMPTY_CELL])
+
+    def read_cache(self, stats):
+        """
+        Читает кэш скомпилированной карты.
+
+        Parameters:
+            stats (dict): Имя слоя -> (mtime, размер) исходных CSV.
+
+        Returns:
+            bool: True, если кэш прочитан и соответствует исходным CSV.
+        """
+        if not os.path.exists(self.cache_path):
+            return False
+
+        try:
+            with open(self.cache_path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            return False
+        if data[:len(MAP_MAGIC)] != MAP_MAGIC:
+            return False
+        try:
+            return self.parse_cache(data, stats)
+        except (struct.error, UnicodeDecodeError, KeyError):
+            # Файл обрезан или поврежден
+            return False
+
+    def parse_cache(self, data, stats):
+        """
+        Разбирает содержимое кэша после MAP_MAGIC.
+
+        Parameters:
+            data (bytes): Содержимое файла кэша.
+            stats (dict): Имя слоя -> (mtime, размер) исходных CSV.
+
+        Returns:
+            bool: True, если кэш цел и соответствует исходным CSV.
+        """
+        position = len(MAP_MAGIC)
+        rows, cols, layer_count = struct.unpack_from('<HHH', data, position)
+        position += 6
+        if layer_count != len(self.sources):
+            return False
+
+        grids = {}
+        filled = {}
+        for _ in range(layer_count):
+            (name_length,) = struct.unpack_from('<H', data, position)
+            position += 2
+            name = data[position:position + name_length].decode('utf-8')
+            position += name_length
+            mtime, size, count = struct.unpack_from('<dQI', data, position)
+            position += struct.calcsize('<dQI')
+            if stats.get(name) != (mtime, size):
+                return False
+
+            if position + count * 4 + rows * cols * 2 > len(data):
+                return False
+            filled[name] = array('i')
+            filled[name].frombytes(data[position:position + count * 4])
+            position += count * 4
+            grids[name] = array('h')
+            grids[name].frombytes(data[position:position + rows * cols * 2])
+            position += rows * cols * 2
+
+        self.rows, self.cols = rows, cols
+        # Порядок слоев берется из sources, а не из файла
+        self.grids = {name: grids[name] for name in self.sources}
+        self.filled = {name: filled[name] for name in self.sources}
+        return True
+
+    def write_cache(self, stats):
+        """
+        Записывает скомпилированную карту в кэш: во временный файл, который затем заменяет кэш,
+        чтобы прерванная запись не оставила обрезанный кэш. Ошибки записи не мешают игре.
+
+        Parameters:
+            stats (dict): Имя слоя -> (mtime, размер) исходных CSV.
+        """
+        temp_path = self.cache_path + '.tmp'
+        try:
+            with open(temp_path, 'wb') as file:
+                file.write(MAP_MAGIC)
+                file.write(struct.pack('<HHH', self.rows, self.cols, len(self.grids)))
+                for name, grid in self.grids.items():
+                    encoded = name.encode('utf-8')
+                    mtime, size = stats[name]
+                    file.write(struct.pack('<H', len(encoded)))
+                    file.write(encoded)
+                    file.write(struct.pack('<dQI', mtime, size, len(self.filled[name])))
+                    file.write(self.filled[name].tobytes())
+                    file.write(grid.tobytes())
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def cells(self, layer):
+        """
+        Перебирает непустые ячейки слоя построчно.
+
+        Parameters:
+            layer (str): Имя слоя.
+
+        Yields:
+            tuple: (строка, столбец, значение).
+        """
+        grid = self.grids[layer]
+        for index in self.filled[layer]:
+            row_index, col_index = divmod(index, self.cols)
+            yield row_index, col_index, grid[index]
+
+    def value(self, layer, row, col):
+        """
+        Возвращает значение ячейки слоя или EMPTY_CELL за пределами карты.
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.grids[layer][row * self.cols + col]
+        return EMPTY_CELL
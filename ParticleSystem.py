@@ -0,0 +1,189 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Начальное количество слотов частиц (при нехватке пул удваивается)
+PARTICLE_CAPACITY = 256
+PARTICLE_ANIMATION_SPEED = 0.15
+
+
+class ParticleProxy(pygame.sprite.Sprite):
+    """
+    Спрайт-заместитель частицы для групп столкновений (например, огонь магии в attack_sprites).
+
+    Не рисуется: частицу рисует ParticleSystem, а заместитель только дает rect и sprite_type
+    для player_attack_logic. Один заместитель на слот пула используется повторно.
+    """
+    def __init__(self):
+        super().__init__()
+        self.sprite_type = 'Птимагия'
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+
+class ParticleSystem:
+    """
+    Пул частиц в виде структуры массивов.
+
+    Частицы (листья, огонь, аура, лечение, смерть врагов) не являются спрайтами камеры: живые частицы
+    хранятся в заранее выделенных массивах (положение, номер анимации, текущий кадр), освободившиеся слоты
+    используются повторно. Все частицы продвигаются одним пакетным обновлением (с NumPy - векторно)
+    и рисуются одним проходом поверх мира, не увеличивая сортировку камеры по глубине.
+
+    Если частица должна участвовать в столкновениях (огонь в attack_sprites), в эти группы добавляется
+    заместитель ParticleProxy ее слота.
+
+    Attributes:
+        owner (pygame.sprite.Group): Группа, через которую рисуются частицы (камера); в нее заместители
+            не добавляются.
+        capacity (int): Текущее количество слотов.
+        x (list): Левая координата частиц в мире.
+        y (list): Верхняя координата частиц в мире.
+        animation (numpy.ndarray или list): Номер набора кадров частицы в animations.
+        frame_index (numpy.ndarray или list): Текущий кадр частиц.
+        alive (numpy.ndarray или list): Занят ли слот.
+        free (list): Свободные слоты (стек).
+        proxies (list): Заместители слотов (создаются при первой нужде).
+        animations (list): Наборы кадров, встречавшиеся в пуле.
+        animation_ids (dict): id набора кадров -> номер в animations.
+        lengths (numpy.ndarray или list): Количество кадров каждого набора.
+        count (int): Количество живых частиц.
+
+    Methods:
+        spawn(frames, pos, groups): Создает частицу.
+        update(): Продвигает анимацию всех частиц и освобождает закончившиеся.
+        draw_list(offset): Возвращает изображения и прямоугольники частиц на экране.
+    """
+    def __init__(self, owner, capacity=PARTICLE_CAPACITY):
+        self.owner = owner
+        self.capacity = 0
+        self.x = []
+        self.y = []
+        self.animation = np.zeros(0, dtype=np.int64) if np is not None else []
+        self.frame_index = np.zeros(0) if np is not None else []
+        self.alive = np.zeros(0, dtype=bool) if np is not None else []
+        self.free = []
+        self.proxies = []
+        self.animations = []
+        self.animation_ids = {}
+        self.lengths = np.zeros(0, dtype=np.int64) if np is not None else []
+        self.count = 0
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """
+        Увеличивает пул до capacity слотов.
+        """
+        added = capacity - self.capacity
+        self.x += [0] * added
+        self.y += [0] * added
+        self.proxies += [None] * added
+        if np is not None:
+            self.animation = np.concatenate((self.animation, np.zeros(added, dtype=np.int64)))
+            self.frame_index = np.concatenate((self.frame_index, np.zeros(added)))
+            self.alive = np.concatenate((self.alive, np.zeros(added, dtype=bool)))
+        else:
+            self.animation += [0] * added
+            self.frame_index += [0.0] * added
+            self.alive += [False] * added
+        # Слоты выдаются с меньших номеров
+        self.free = list(range(capacity - 1, self.capacity - 1, -1)) + self.free
+        self.capacity = capacity
+
+    def animation_id(self, frames):
+        key = id(frames)
+        if key not in self.animation_ids:
+            self.animation_ids[key] = len(self.animations)
+            self.animations.append(frames)
+            if np is not None:
+                self.lengths = np.append(self.lengths, len(frames))
+            else:
+                self.lengths.append(len(frames))
+        return self.animation_ids[key]
+
+    def spawn(self, frames, pos, groups=()):
+        """
+        Создает частицу с центром первого кадра в pos.
+
+        Parameters:
+            frames (list): Кадры анимации частицы.
+            pos (tuple): Координаты центра частицы.
+            groups: Группа или список групп; кроме owner, в них добавляется заместитель частицы.
+        """
+        if not self.free:
+            self.grow(self.capacity * 2)
+        slot = self.free.pop()
+        rect = frames[0].get_rect(center=pos)
+        self.x[slot] = rect.x
+        self.y[slot] = rect.y
+        self.animation[slot] = self.animation_id(frames)
+        self.frame_index[slot] = 0
+        self.alive[slot] = True
+        self.count += 1
+
+        if isinstance(groups, pygame.sprite.AbstractGroup):
+            groups = [groups]
+        for group in groups:
+            if group is self.owner:
+                continue
+            if self.proxies[slot] is None:
+                self.proxies[slot] = ParticleProxy()
+            self.proxies[slot].rect = rect
+            group.add(self.proxies[slot])
+
+    def release(self, slot):
+        self.alive[slot] = False
+        self.free.append(slot)
+        self.count -= 1
+        if self.proxies[slot] is not None:
+            self.proxies[slot].kill()
+
+    def update(self):
+        """
+        Продвигает кадры всех частиц на PARTICLE_ANIMATION_SPEED и освобождает частицы, чья анимация
+        закончилась.
+        """
+        if not self.count:
+            return
+
+        if np is not None:
+            np.add(self.frame_index, PARTICLE_ANIMATION_SPEED, out=self.frame_index, where=self.alive)
+            finished = self.frame_index.astype(np.int64) >= self.lengths[self.animation]
+            for slot in np.flatnonzero(finished & self.alive).tolist():
+                self.release(slot)
+            return
+
+        for slot in range(self.capacity):
+            if self.alive[slot]:
+                self.frame_index[slot] += PARTICLE_ANIMATION_SPEED
+                if int(self.frame_index[slot]) >= self.lengths[self.animation[slot]]:
+                    self.release(slot)
+
+    def draw_list(self, offset):
+        """
+        Возвращает живые частицы для отрисовки.
+
+        Parameters:
+            offset (pygame.math.Vector2): Смещение камеры.
+
+        Returns:
+            list: Пары (слот, (изображение, прямоугольник на экране)) в порядке слотов.
+        """
+        offset_x, offset_y = int(offset.x), int(offset.y)
+        if np is not None:
+            slots = np.flatnonzero(self.alive)
+            animations = self.animation[slots].tolist()
+            frames = self.frame_index[slots].astype(np.int64).tolist()
+            slots = slots.tolist()
+        else:
+            slots = [slot for slot in range(self.capacity) if self.alive[slot]]
+            animations = [self.animation[slot] for slot in slots]
+            frames = [int(self.frame_index[slot]) for slot in slots]
+
+        items = []
+        for slot, animation, frame in zip(slots, animations, frames):
+            image = self.animations[animation][frame]
+            items.append((slot, (image, image.get_rect(topleft=(self.x[slot] - offset_x, self.y[slot] - offset_y)))))
+        return items
@@ -0,0 +1,151 @@
+from array import array
+import pygame
+
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Оверлей производительности
+OVERLAY_HISTORY = 120
+OVERLAY_FONT_SIZE = 20
+OVERLAY_WIDTH = 300
+OVERLAY_GRAPH_HEIGHT = 60
+OVERLAY_PADDING = 8
+OVERLAY_BG_COLOR = '#111111'
+OVERLAY_TEXT_COLOR = '#EEEEEE'
+OVERLAY_GRAPH_COLOR = 'gold'
+OVERLAY_BUDGET_COLOR = 'red'
+OVERLAY_PHASES = ('custom_draw', 'update', 'enemy_update', 'player_attack_logic', 'ui.display')
+
+
+class PerfOverlay:
+    """
+    Оверлей производительности (переключается клавишей F3).
+
+    Показывает FPS, график времени кадра, время фаз кадра, количество спрайтов в группах уровня,
+    количество отрисованных и отсеченных камерой слоев и уровни ИИ врагов. Время кадров и фаз хранится
+    в кольцевых буферах на OVERLAY_HISTORY последних кадров. Шрифт создается один раз, каждый символ
+    рендерится один раз и дальше берется из кэша глифов.
+
+    Пока оверлей скрыт, Game не передает ему кадры, а таймер фаз уровня выключен, поэтому он ничего не стоит.
+
+    Attributes:
+        visible (bool): Показывается ли оверлей.
+        frame_times (array): Кольцевой буфер времени кадров (мс).
+        phase_times (dict): Фаза -> кольцевой буфер ее времени (мс).
+        cursor (int): Позиция следующей записи в буферах.
+        filled (int): Количество записанных кадров (не больше OVERLAY_HISTORY).
+        font (pygame.font.Font): Шрифт оверлея (создается при первом показе).
+        glyphs (dict): Символ -> отрендеренная поверхность.
+        rect (pygame.Rect): Область экрана, занятая оверлеем.
+
+    Methods:
+        toggle(level): Показывает или скрывает оверлей.
+        record(frame_time, level): Записывает кадр в кольцевые буферы.
+        draw(surface, level): Рисует оверлей.
+    """
+    def __init__(self):
+        self.visible = False
+        self.frame_times = array('f', bytes(4 * OVERLAY_HISTORY))
+        self.phase_times = {phase: array('f', bytes(4 * OVERLAY_HISTORY)) for phase in OVERLAY_PHASES}
+        self.cursor = 0
+        self.filled = 0
+        self.font = None
+        self.glyphs = {}
+        self.rect = pygame.Rect(WIDTH - OVERLAY_WIDTH - OVERLAY_PADDING, OVERLAY_PADDING, OVERLAY_WIDTH, 0)
+
+    def toggle(self, level):
+        """
+        Показывает или скрывает оверлей и включает замер фаз уровня только на время показа.
+
+        Parameters:
+            level (Level): Уровень, чьи фазы замеряются.
+        """
+        self.visible = not self.visible
+        level.frame_timer.enabled = self.visible
+        level.frame_timer.reset()
+        self.cursor = self.filled = 0
+        # В режиме грязных прямоугольников место оверлея нужно перерисовать целиком
+        level.visible_sprites.drawn_state = None
+        if self.visible and self.font is None:
+            self.font = pygame.font.Font(None, OVERLAY_FONT_SIZE)
+
+    def record(self, frame_time, level):
+        """
+        Записывает время кадра и последнее время каждой фазы в кольцевые буферы.
+
+        Parameters:
+            frame_time (float): Время кадра в миллисекундах.
+            level (Level): Уровень с таймером фаз.
+        """
+        self.frame_times[self.cursor] = frame_time
+        samples = level.frame_timer.samples
+        for phase, times in self.phase_times.items():
+            times[self.cursor] = sum(samples.get(phase, ()))
+        level.frame_timer.reset()
+        self.cursor = (self.cursor + 1) % OVERLAY_HISTORY
+        self.filled = min(self.filled + 1, OVERLAY_HISTORY)
+
+    def glyph(self, char):
+        if char not in self.glyphs:
+            self.glyphs[char] = self.font.render(char, True, OVERLAY_TEXT_COLOR)
+        return self.glyphs[char]
+
+    def text(self, surface, line, x, y):
+        """
+        Рисует строку из кэшированных глифов.
+        """
+        for char in line:
+            glyph = self.glyph(char)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+
+    def mean(self, values):
+        return sum(values[:self.filled]) / self.filled if self.filled else 0.0
+
+    def draw(self, surface, level):
+        """
+        Рисует оверлей: текстовые строки и график времени кадра за последние OVERLAY_HISTORY кадров.
+
+        Parameters:
+            surface (pygame.Surface): Поверхность экрана.
+            level (Level): Уровень, чьи данные показываются.
+        """
+        frame_mean = self.mean(self.frame_times)
+        camera = level.visible_sprites
+        lines = [
+            f'FPS {1000 / frame_mean:.0f}  кадр {frame_mean:.2f} мс' if frame_mean else 'FPS -',
+        ]
+        lines += [f'{phase} {self.mean(times):.2f} мс' for phase, times in self.phase_times.items()]
+        lines += [
+            f'visible {len(camera.sprite_order)}  obstacle {len(level.obstacle_sprites.order)}',
+            f'attackable {len(level.attackable_sprites.order)}  attack {len(level.attack_sprites)}',
+            f'blit {camera.drawn_count}  отсечено {camera.culled_count}',
+            'ИИ ' + '  '.join(f'{tier} {count}' for tier, count in camera.ai_scheduler.counts.items()),
+        ]
+
+        line_height = self.font.get_linesize()
+        self.rect.height = OVERLAY_PADDING * 3 + line_height * len(lines) + OVERLAY_GRAPH_HEIGHT
+        pygame.draw.rect(surface, OVERLAY_BG_COLOR, self.rect)
+
+        x = self.rect.x + OVERLAY_PADDING
+        y = self.rect.y + OVERLAY_PADDING
+        for line in lines:
+            self.text(surface, line, x, y)
+            y += line_height
+
+        # График: столбик на кадр, линия - бюджет кадра при FPS
+        y += OVERLAY_PADDING
+        graph_width = OVERLAY_WIDTH - OVERLAY_PADDING * 2
+        bar_width = graph_width / OVERLAY_HISTORY
+        scale = OVERLAY_GRAPH_HEIGHT / (2000 / FPS)
+        for index in range(self.filled):
+            frame_time = self.frame_times[(self.cursor - self.filled + index) % OVERLAY_HISTORY]
+            height = min(OVERLAY_GRAPH_HEIGHT, max(1, round(frame_time * scale)))
+            bar_x = x + int(index * bar_width)
+            pygame.draw.line(surface, OVERLAY_GRAPH_COLOR, (bar_x, y + OVERLAY_GRAPH_HEIGHT),
+                             (bar_x, y + OVERLAY_GRAPH_HEIGHT - height))
+        budget_y = y + OVERLAY_GRAPH_HEIGHT - round(1000 / FPS * scale)
+        pygame.draw.line(surface, OVERLAY_BUDGET_COLOR, (x, budget_y), (x + graph_width, budget_y))
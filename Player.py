@@ -12,6 +12,14 @@ magic_data = {
     'heal': {'strength': 20, 'cost': 10, 'graphic': 'воздух.png'},
 }
 
+# Кадры анимаций игрока
+player_animations = {
+    'Вид_сзади': ['вид_сзади1.png', 'вид_сзади2.png'],
+    'Вид_слева': ['вид_слева1.png', 'вид_слева2.png'],
+    'Вид_спереди': ['вид_спереди1.png', 'вид_спереди2.png'],
+    'Вид_справа': ['вид_справа1.png', 'вид_справа2.png']
+}
+
 
 class Player(Entity):
     def __init__(self, pos, groups, obstacle_sprites, create_attack, destroy_attack, create_magic):
@@ -31,7 +39,7 @@ class Player(Entity):
         super().__init__(groups)
         self.hit_time = None
         self.animations = None
-        self.image = pygame.image.load('яшулька_2версия.png').convert_alpha()
+        self.image = assets.image('яшулька_2версия.png')
         self.image = pygame.transform.scale(self.image, (64, 64))
         self.rect = self.image.get_rect(topleft=pos)
         self.hitbox = self.rect.inflate(0, -26)
@@ -74,34 +82,44 @@ class Player(Entity):
         self.hurt_time = None
         self.invulnerability_duration = 500
 
+        # Источник состояния клавиш (например, InputRecorder.read или InputReplay.read); None - клавиатура
+        self.input_source = None
+
     def import_player_assets(self):
         """
         Импортирует анимации и изображения для игрового персонажа.
         """
         character_path = ''  # Путь к папке с анимациями персонажа
-        self.animations = {
-            'Вид_сзади': ['вид_сзади1.png', 'вид_сзади2.png'],
-            'Вид_слева': ['вид_слева1.png', 'вид_слева2.png'],
-            'Вид_спереди': ['вид_спереди1.png', 'вид_спереди2.png'],
-            'Вид_справа': ['вид_справа1.png', 'вид_справа2.png']
-        }
+        self.animations = {key: list(files) for key, files in player_animations.items()}
 
         for animation_key in self.animations:
             animation_files = self.animations[animation_key]
             animation_images = []
             for file in animation_files:
                 full_path = character_path + file
-                image_surf = pygame.image.load(full_path).convert_alpha()
+                image_surf = assets.image(full_path)
                 animation_images.append(image_surf)
             self.animations[animation_key] = animation_images
+        self.import_flash_frames()
+
+    @staticmethod
+    def asset_paths():
+        """
+        Возвращает пути ко всем изображениям игрока.
+
+        Возвращает:
+        list: Пути к файлам изображений (для фоновой предзагрузки).
+        """
+        return ['яшулька_2версия.png'] + [file for files in player_animations.values() for file in files]
 
     def input(self):
         """
         Обработка пользовательского ввода.
 
         Реагирует на нажатия клавиш для управления персонажем, а также для атаки и магии.
+        Клавиши читаются из input_source, если он задан, иначе с клавиатуры.
         """
-        keys = pygame.key.get_pressed()
+        keys = self.input_source() if self.input_source is not None else pygame.key.get_pressed()
 
         if keys[pygame.K_w]:
             self.direction.y = -1
@@ -121,13 +139,13 @@ class Player(Entity):
         if keys[pygame.K_e] and not self.attacking:
             self.attacking = True
             self.is_attacking = True
-            self.attack_time = pygame.time.get_ticks()
+            self.attack_time = sim_clock.ticks()
             self.create_attack()
 
         # Магия
         if keys[pygame.K_q] and not self.attacking:
             self.attacking = True
-            self.attack_time = pygame.time.get_ticks()
+            self.attack_time = sim_clock.ticks()
             style = list(magic_data.keys())[self.magic_index]
             strength = list(magic_data.values())[self.magic_index]['strength'] + self.stats['Птимагия']
             cost = list(magic_data.values())[self.magic_index]['cost']
@@ -136,7 +154,7 @@ class Player(Entity):
 
         if keys[pygame.K_r] and self.can_switch_weapon:
             self.can_switch_weapon = False
-            self.weapon_switch_time = pygame.time.get_ticks()
+            self.weapon_switch_time = sim_clock.ticks()
 
             if self.weapon_index < len(list(weapon_data.keys())) - 1:
                 self.weapon_index += 1
@@ -147,7 +165,7 @@ class Player(Entity):
 
         if keys[pygame.K_TAB] and self.can_switch_magic:
             self.can_switch_magic = False
-            self.magic_switch_time = pygame.time.get_ticks()
+            self.magic_switch_time = sim_clock.ticks()
 
             if self.magic_index < len(list(magic_data.keys())) - 1:
                 self.magic_index += 1
@@ -191,7 +209,7 @@ class Player(Entity):
         if self.vulnerable:
             self.Wingchest -= amount
             self.vulnerable = False
-            self.hit_time = pygame.time.get_ticks()
+            self.hit_time = sim_clock.ticks()
 
     def cooldowns(self):
         """
@@ -199,7 +217,7 @@ class Player(Entity):
 
         Контролирует перезарядку атаки, смены оружия и магии, а также времени неуязвимости после получения урона.
         """
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.ticks()
 
         if self.attacking:
             if current_time - self.attack_time >= self.attack_cooldown + weapon_data[self.weapon]['cooldown']:
@@ -231,15 +249,9 @@ class Player(Entity):
             if self.frame_index >= len(animation):
                 self.frame_index = 0
 
-        self.image = animation[int(self.frame_index)]
+        self.image = self.frame_image()
         self.rect = self.image.get_rect(center=self.hitbox.center)
 
-        if not self.vulnerable:
-            alpha = self.wave_value()
-            self.image.set_alpha(alpha)
-        else:
-            self.image.set_alpha(255)
-
     def get_full_weapon_damage(self):
         """
         Получает полный урон от оружия.
@@ -0,0 +1,44 @@
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Длительность одного шага симуляции в миллисекундах
+SIM_STEP = 1000 / FPS
+
+
+class SimClock:
+    """
+    Часы симуляции.
+
+    Игровые таймеры (перезарядки, неуязвимость, смена изображения Лизы) отсчитываются не от pygame.time.get_ticks,
+    а от времени симуляции, которое растет на SIM_STEP за каждый шаг Level.update. Поэтому игра идет одинаково
+    при любой частоте отрисовки, а без отрисовки симуляцию можно прогонять быстрее реального времени.
+
+    Attributes:
+        time (float): Время симуляции в миллисекундах.
+        steps (int): Количество выполненных шагов.
+
+    Methods:
+        ticks(): Возвращает время симуляции в целых миллисекундах (замена pygame.time.get_ticks).
+        advance(): Сдвигает время на один шаг.
+        reset(): Возвращает время к нулю (при создании уровня).
+    """
+    def __init__(self):
+        self.time = 0.0
+        self.steps = 0
+
+    def reset(self):
+        self.time = 0.0
+        self.steps = 0
+
+    def ticks(self):
+        return int(self.time)
+
+    def advance(self):
+        self.steps += 1
+        self.time = self.steps * SIM_STEP
+
+
+sim_clock = SimClock()
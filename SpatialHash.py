@@ -0,0 +1,132 @@
+import pygame
+
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Размер ячейки пространственного хеша
+HASH_CELL_SIZE = TILESIZE * 2
+
+
+class SpatialHash(pygame.sprite.Group):
+    """
+    Группа спрайтов с пространственным хешем для поиска по области.
+
+    Спрайты раскладываются по ячейкам HASH_CELL_SIZE по своему rect. Неподвижные спрайты (трава)
+    раскладываются один раз, подвижные (у которых есть метод move, то есть сущности) перекладываются
+    методом refresh() только если их rect ушел в другие ячейки. Добавление и kill() обновляют хеш сразу.
+    Статичные тайлы травы (Tile из TileLayer) добавляются через add_tile и хранятся в хеше наравне со спрайтами.
+
+    Attributes:
+        cells (dict): Словарь (колонка, строка) -> множество спрайтов в ячейке.
+        sprite_cells (dict): Словарь спрайт -> кортеж ячеек, в которые он разложен.
+        moving (set): Подвижные спрайты, которые проверяются при refresh().
+        pending (list): Спрайты, добавленные в группу, но еще не разложенные по ячейкам.
+        order (dict): Порядковый номер добавления спрайта, чтобы результаты шли в порядке группы.
+
+    Methods:
+        add_tile(tile): Добавляет статичный тайл.
+        remove_tile(tile): Удаляет статичный тайл.
+        refresh(): Перекладывает подвижные спрайты, сменившие ячейки.
+        query(rect): Возвращает спрайты, чей rect пересекает прямоугольник.
+    """
+    def __init__(self, *sprites):
+        self.cells = {}
+        self.sprite_cells = {}
+        self.moving = set()
+        self.pending = []
+        self.order = {}
+        self.counter = 0
+        super().__init__(*sprites)
+
+    @staticmethod
+    def cells_for(rect):
+        """
+        Возвращает кортеж ячеек хеша, которые пересекает прямоугольник.
+
+        Parameters:
+            rect (pygame.Rect): Прямоугольник в мировых координатах.
+
+        Returns:
+            tuple: Кортежи (колонка, строка).
+        """
+        left = rect.left // HASH_CELL_SIZE
+        right = (rect.right - 1) // HASH_CELL_SIZE
+        top = rect.top // HASH_CELL_SIZE
+        bottom = (rect.bottom - 1) // HASH_CELL_SIZE
+        return tuple((col, row) for row in range(top, bottom + 1) for col in range(left, right + 1))
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        sprite_registry.add(sprite, self)
+        self.order[sprite] = self.counter
+        self.counter += 1
+        if hasattr(sprite, 'move'):
+            self.moving.add(sprite)
+        # rect тайла может поправляться уже после добавления в группу, поэтому раскладка откладывается
+        self.pending.append(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        sprite_registry.remove(sprite, self)
+        self.order.pop(sprite, None)
+        self.moving.discard(sprite)
+        self.unlink(sprite)
+
+    def add_tile(self, tile):
+        self.order[tile] = self.counter
+        self.counter += 1
+        self.pending.append(tile)
+
+    def remove_tile(self, tile):
+        self.order.pop(tile, None)
+        self.unlink(tile)
+
+    def link(self, sprite, cells):
+        self.sprite_cells[sprite] = cells
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(sprite)
+
+    def unlink(self, sprite):
+        for cell in self.sprite_cells.pop(sprite, ()):
+            bucket = self.cells[cell]
+            bucket.discard(sprite)
+            if not bucket:
+                del self.cells[cell]
+
+    def refresh(self):
+        """
+        Раскладывает новые спрайты и перекладывает подвижные, если их rect сменил ячейки.
+        """
+        for sprite in self.pending:
+            if sprite in self.order and sprite not in self.sprite_cells:
+                self.link(sprite, self.cells_for(sprite.rect))
+        self.pending = []
+
+        for sprite in self.moving:
+            cells = self.cells_for(sprite.rect)
+            if cells != self.sprite_cells.get(sprite):
+                self.unlink(sprite)
+                self.link(sprite, cells)
+
+    def query(self, rect):
+        """
+        Возвращает спрайты, чей rect пересекает прямоугольник.
+
+        Parameters:
+            rect (pygame.Rect): Прямоугольник запроса (например, rect атаки).
+
+        Returns:
+            list: Спрайты и тайлы в порядке их добавления в группу, как у pygame.sprite.spritecollide.
+        """
+        if self.pending:
+            self.refresh()
+
+        found = set()
+        for cell in self.cells_for(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(sprite for sprite in bucket if sprite.rect.colliderect(rect))
+        return sorted(found, key=self.order.__getitem__)
@@ -0,0 +1,126 @@
+class SpriteRegistry:
+    """
+    Реестр живых спрайтов с индексами по типу, по имени и по группе.
+
+    Группы уровня (Camera, CollisionGrid, SpatialHash) сообщают реестру о каждом добавлении и удалении
+    спрайта, поэтому индексы обновляются сами, в том числе при kill(). Запросы "все враги" или
+    "спрайт с именем лиза1.png" возвращают только подходящие спрайты, не перебирая все спрайты уровня.
+
+    Тип спрайта - его атрибут sprite_type (без него - имя класса), имя - атрибут image_name.
+    Оба атрибута выставляются уже после добавления спрайта в группы (в конструкторе после
+    super().__init__(groups)), поэтому новые спрайты попадают в индексы типа и имени при первом запросе.
+    Спрайты в индексах идут в порядке первого добавления в группы.
+
+    Attributes:
+        groups (dict): Группа -> спрайты группы (словарь как упорядоченное множество).
+        memberships (dict): Спрайт -> количество групп реестра, в которых он состоит.
+        types (dict): Тип -> спрайты этого типа.
+        names (dict): Имя -> спрайты с этим именем.
+        keys (dict): Спрайт -> (тип, имя), под которыми он внесен в индексы.
+        pending (dict): Спрайты, еще не внесенные в индексы типа и имени (словарь как упорядоченное
+            множество; спрайт, удаленный из всех групп, сразу убирается и отсюда).
+
+    Methods:
+        add(sprite, group): Отмечает добавление спрайта в группу.
+        remove(sprite, group): Отмечает удаление спрайта из группы.
+        of_type(sprite_type, group): Возвращает спрайты типа.
+        named(name, group): Возвращает спрайты с именем.
+        in_group(group): Возвращает спрайты группы.
+        reset(): Очищает реестр (при создании уровня).
+    """
+    def __init__(self):
+        self.groups = {}
+        self.memberships = {}
+        self.types = {}
+        self.names = {}
+        self.keys = {}
+        self.pending = {}
+
+    def reset(self):
+        self.__init__()
+
+    def add(self, sprite, group):
+        self.groups.setdefault(group, {})[sprite] = None
+        count = self.memberships.get(sprite, 0)
+        self.memberships[sprite] = count + 1
+        if not count:
+            self.pending[sprite] = None
+
+    def remove(self, sprite, group):
+        members = self.groups.get(group)
+        if members is None or sprite not in members:
+            return
+        del members[sprite]
+        count = self.memberships.pop(sprite) - 1
+        if count:
+            self.memberships[sprite] = count
+            return
+        self.pending.pop(sprite, None)
+        keys = self.keys.pop(sprite, None)
+        if keys is not None:
+            sprite_type, name = keys
+            self.unindex(self.types, sprite_type, sprite)
+            self.unindex(self.names, name, sprite)
+
+    @staticmethod
+    def unindex(index, key, sprite):
+        bucket = index[key]
+        del bucket[sprite]
+        if not bucket:
+            del index[key]
+
+    def resolve(self):
+        """
+        Вносит в индексы типа и имени спрайты, добавленные с момента последнего запроса.
+        """
+        for sprite in self.pending:
+            if sprite not in self.memberships or sprite in self.keys:
+                continue
+            sprite_type = getattr(sprite, 'sprite_type', type(sprite).__name__)
+            name = getattr(sprite, 'image_name', None)
+            self.keys[sprite] = (sprite_type, name)
+            self.types.setdefault(sprite_type, {})[sprite] = None
+            self.names.setdefault(name, {})[sprite] = None
+        self.pending = {}
+
+    def select(self, index, key, group):
+        if self.pending:
+            self.resolve()
+        sprites = index.get(key, ())
+        if group is None:
+            return list(sprites)
+        members = self.groups.get(group, {})
+        return [sprite for sprite in sprites if sprite in members]
+
+    def of_type(self, sprite_type, group=None):
+        """
+        Возвращает живые спрайты типа.
+
+        Parameters:
+            sprite_type (str): sprite_type спрайта (например, 'enemy') или имя класса.
+            group (pygame.sprite.Group): Если задана - только спрайты этой группы.
+
+        Returns:
+            list: Спрайты в порядке добавления.
+        """
+        return self.select(self.types, sprite_type, group)
+
+    def named(self, name, group=None):
+        """
+        Возвращает живые спрайты с именем изображения.
+
+        Parameters:
+            name (str): image_name спрайта (например, 'лиза1.png').
+            group (pygame.sprite.Group): Если задана - только спрайты этой группы.
+
+        Returns:
+            list: Спрайты в порядке добавления.
+        """
+        return self.select(self.names, name, group)
+
+    def in_group(self, group):
+        return list(self.groups.get(group, ()))
+
+
+# Общий реестр спрайтов уровня
+sprite_registry = SpriteRegistry()
@@ -0,0 +1,87 @@
+import pygame
+
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Размер чанка статичных тайлов (в тайлах)
+CHUNK_SIZE = 8
+
+
+class StaticChunk:
+    """
+    Запеченный слой статичных спрайтов и тайлов одного чанка.
+
+    Чанк CHUNK_SIZE x CHUNK_SIZE тайлов делится на слои по centery: все статичные спрайты чанка с одинаковым
+    centery (ряд травы, отдельный объект) рисуются в одну поверхность. Камера сортирует слой как один спрайт
+    с этим centery, поэтому игрок и враги по-прежнему проходят перед объектами и за ними.
+    Поверхность перерисовывается только когда состав слоя изменился (например, срезали траву).
+
+    Attributes:
+        key (tuple): Ключ слоя (колонка чанка, строка чанка, centery).
+        members (list): Пары (порядковый номер, спрайт) в порядке добавления в камеру.
+        image (pygame.Surface): Запеченная поверхность слоя.
+        rect (pygame.Rect): Прямоугольник слоя в мировых координатах (объединение rect участников).
+        dirty (bool): Нужно ли перезапечь поверхность перед отрисовкой.
+
+    Methods:
+        add(order, sprite): Добавляет спрайт в слой.
+        remove(sprite): Удаляет спрайт из слоя.
+        overhang(): Возвращает, насколько слой выходит за границы чанка.
+        bake(): Перерисовывает поверхность слоя из участников.
+    """
+    def __init__(self, key):
+        self.key = key
+        self.members = []
+        self.image = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.dirty = True
+
+    @staticmethod
+    def key_for(sprite):
+        """
+        Возвращает ключ слоя, к которому относится статичный спрайт.
+
+        Parameters:
+            sprite (pygame.sprite.Sprite): Статичный спрайт с окончательно выставленным rect.
+
+        Returns:
+            tuple: (колонка чанка, строка чанка, centery).
+        """
+        chunk_pixels = CHUNK_SIZE * TILESIZE
+        return sprite.rect.centerx // chunk_pixels, sprite.rect.centery // chunk_pixels, sprite.rect.centery
+
+    def overhang(self):
+        """
+        Возвращает, на сколько пикселей rect слоя выходит за границы его чанка (0, если не выходит).
+        """
+        chunk_pixels = CHUNK_SIZE * TILESIZE
+        left, top = self.key[0] * chunk_pixels, self.key[1] * chunk_pixels
+        return max(0, left - self.rect.left, top - self.rect.top,
+                   self.rect.right - left - chunk_pixels, self.rect.bottom - top - chunk_pixels)
+
+    @property
+    def order(self):
+        return self.members[0][0]
+
+    def add(self, order, sprite):
+        self.members.append((order, sprite))
+        self.members.sort(key=lambda member: member[0])
+        self.rect = self.rect.union(sprite.rect) if len(self.members) > 1 else sprite.rect.copy()
+        self.dirty = True
+
+    def remove(self, sprite):
+        self.members = [member for member in self.members if member[1] != sprite]
+        self.dirty = True
+
+    def bake(self):
+        """
+        Перерисовывает поверхность слоя: участники рисуются в порядке добавления, как их рисовала камера.
+        """
+        self.rect = self.members[0][1].rect.unionall([sprite.rect for order, sprite in self.members])
+        self.image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        for order, sprite in self.members:
+            self.image.blit(sprite.image, (sprite.rect.x - self.rect.x, sprite.rect.y - self.rect.y))
+        self.dirty = False
@@ -1,33 +1,45 @@
-import pygame
-
-# Настройки игры
-WIDTH = 1280
-HEIGHT = 720
-FPS = 60
-TILESIZE = 64
-
-
-class Tile(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, sprite_type, image=None):
-        """
-        Конструктор класса Tile.
-
-        Создает объект спрайта, представляющего тайл (картографический элемент) в игре.
-
-        Параметры:
-        pos (tuple): Кортеж с координатами (x, y) для размещения спрайта на экране.
-        groups (list): Список групп спрайтов, к которым будет добавлен данный спрайт.
-        sprite_type (str): Тип тайла, определяющий его назначение (например, 'object' для объектов на карте).
-        image (pygame.Surface, optional): Изображение тайла. Если не указано, будет создана пустая поверхность.
-
-        Примечание:
-        - Для типа 'object' корректное позиционирование будет происходить выше на TILESIZE пикселей.
-        """
-        super().__init__(groups)
-        self.sprite_type = sprite_type
-        self.image = image if image else pygame.Surface((TILESIZE, TILESIZE))
-        if sprite_type == 'object':
-            self.rect = self.image.get_rect(topleft=(pos[0], pos[1] - TILESIZE))
-        else:
-            self.rect = self.image.get_rect(topleft=pos)
-        self.hitbox = self.rect.inflate(0, -10)
\ No newline at end of file
+from collections import namedtuple
+
+
+class Tile(namedtuple('Tile', ('layer', 'index'))):
+    """
+    Ссылка на статичный тайл (картографический элемент), хранящийся в TileLayer.
+
+    Ссылка - это пара (слой, номер тайла в слое); две ссылки на один тайл равны и дают один ключ словаря,
+    поэтому группы хранят ссылки вместо спрайтов. Свойства вычисляются из массивов слоя при обращении.
+
+    Attributes:
+        layer (TileLayer): Слой, в котором хранится тайл.
+        index (int): Номер тайла в слое.
+        sprite_type (str): Тип тайла ('невидимость', 'grass', 'object').
+        image (pygame.Surface): Изображение тайла (None у невидимых тайлов).
+        rect (pygame.Rect): Прямоугольник тайла в мировых координатах.
+        hitbox (pygame.Rect): Прямоугольник-столкновение тайла.
+
+    Methods:
+        alive(): Проверяет, находится ли тайл в мире.
+        kill(): Убирает тайл из мира и из всех групп слоя.
+    """
+    __slots__ = ()
+
+    @property
+    def sprite_type(self):
+        return self.layer.sprite_type
+
+    @property
+    def image(self):
+        return self.layer.surface(self.index)
+
+    @property
+    def rect(self):
+        return self.layer.rect(self.index)
+
+    @property
+    def hitbox(self):
+        return self.layer.hitbox(self.index)
+
+    def alive(self):
+        return bool(self.layer.alive[self.index])
+
+    def kill(self):
+        self.layer.remove(self.index)
@@ -0,0 +1,122 @@
+import pygame
+from array import array
+
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Нет изображения (невидимые тайлы границы)
+NO_IMAGE = -1
+
+
+class TileLayer:
+    """
+    Компактное хранилище статичных тайлов одного слоя карты.
+
+    Тайлы не являются спрайтами: положение, номер изображения и признак жизни каждого тайла лежат в массивах
+    слоя, а rect и хитбокс вычисляются из них по запросу. Размер тайла берется из его изображения
+    (без изображения - TILESIZE x TILESIZE), хитбокс - rect без 10 пикселей высоты, сдвинутый вниз на hitbox_top.
+    Группы, в которых состоят тайлы слоя, общие для всего слоя: при добавлении и удалении тайла слой
+    сообщает о нем каждой группе (add_tile/remove_tile) в их порядке, как Sprite при создании и kill().
+
+    Снаружи тайл представлен ссылкой Tile(слой, номер), которая дает столкновениям, камере и
+    player_attack_logic только то, что им нужно: sprite_type, image, rect, hitbox, alive() и kill().
+
+    Attributes:
+        sprite_type (str): Тип тайлов слоя ('невидимость', 'grass', 'object').
+        groups (list): Группы, в которые добавляются тайлы слоя.
+        images (list): Изображения тайлов слоя.
+        hitbox_top (int): Сдвиг верха хитбокса относительно rect.
+        x (array): Левая координата rect тайлов.
+        y (array): Верхняя координата rect тайлов.
+        image (array): Номер изображения тайлов в images (NO_IMAGE - без изображения).
+        alive (bytearray): Находится ли тайл в мире.
+        free (list): Освобожденные номера тайлов (стек), которые занимают новые тайлы.
+
+    Methods:
+        add(x, y, image_index): Добавляет тайл в слой и в группы слоя.
+        remove(index): Убирает тайл из мира и из групп слоя.
+        release(index): Убирает тайл и освобождает его номер (при выгрузке области).
+        rect(index): Возвращает прямоугольник тайла.
+        hitbox(index): Возвращает хитбокс тайла.
+        surface(index): Возвращает изображение тайла.
+    """
+    def __init__(self, sprite_type, groups, images=(), hitbox_top=0):
+        self.sprite_type = sprite_type
+        self.groups = groups
+        self.images = images
+        self.hitbox_top = hitbox_top
+        self.x = array('i')
+        self.y = array('i')
+        self.image = array('h')
+        self.alive = bytearray()
+        self.free = []
+
+    def __len__(self):
+        return len(self.alive)
+
+    def add(self, x, y, image_index=NO_IMAGE):
+        """
+        Добавляет тайл в мир, занимая освобожденный номер, если он есть, поэтому при потоковой подгрузке
+        массивы слоя не растут с каждой посещенной областью.
+
+        Parameters:
+            x (int): Левая координата rect.
+            y (int): Верхняя координата rect.
+            image_index (int): Номер изображения в images.
+
+        Returns:
+            Tile: Ссылка на тайл.
+        """
+        if not self.free:
+            index = len(self.alive)
+            self.x.append(x)
+            self.y.append(y)
+            self.image.append(image_index)
+            self.alive.append(1)
+        else:
+            index = self.free.pop()
+            self.x[index] = x
+            self.y[index] = y
+            self.image[index] = image_index
+            self.alive[index] = 1
+
+        tile = Tile(self, index)
+        for group in self.groups:
+            group.add_tile(tile)
+        return tile
+
+    def remove(self, index):
+        if not self.alive[index]:
+            return
+        self.alive[index] = 0
+        tile = Tile(self, index)
+        for group in self.groups:
+            group.remove_tile(tile)
+
+    def release(self, index):
+        """
+        Убирает тайл из мира (если он еще жив) и возвращает его номер в free. Вызывается только когда на тайл
+        больше никто не ссылается (WorldStreamer при выгрузке области); ссылки Tile на освобожденный номер
+        после этого указывают на новый тайл.
+        """
+        self.remove(index)
+        self.free.append(index)
+
+    def surface(self, index):
+        image_index = self.image[index]
+        return self.images[image_index] if image_index != NO_IMAGE else None
+
+    def rect(self, index):
+        image_index = self.image[index]
+        if image_index == NO_IMAGE:
+            return pygame.Rect(self.x[index], self.y[index], TILESIZE, TILESIZE)
+        return self.images[image_index].get_rect(topleft=(self.x[index], self.y[index]))
+
+    def hitbox(self, index):
+        rect = self.rect(index)
+        rect.y += self.hitbox_top
+        rect.height -= 10
+        return rect
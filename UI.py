@@ -45,6 +45,8 @@ class UI:
            Aviculture_bar_rect (pygame.Rect): Прямоугольник для отображения панели энергии (птичьи перья).
            weapon_graphics (list): Список поверхностей изображений оружия.
            magic_graphics (list): Список поверхностей изображений магических способностей.
+           last_state (tuple): Значения игрока, отображенные в прошлом кадре.
+           dirty_rects (list): Области интерфейса, изменившиеся в последнем кадре.
 
        Methods:
            show_bar(current, max_amount, bg_rect, color):
@@ -55,6 +57,8 @@ class UI:
                Отображает изображение оружия на интерфейсе.
            magic_overlay(magic_index, has_switched):
                Отображает изображение магической способности на интерфейсе.
+           asset_paths():
+               Возвращает пути к изображениям оружия и магии.
            display(player):
                Отображает интерфейс игрока, включая панели состояния, оружие и магические способности.
        """
@@ -69,14 +73,28 @@ class UI:
         self.weapon_graphics = []
         for weapon in weapon_data.values():
             path = weapon['graphic']
-            weapon = pygame.image.load(path).convert_alpha()
+            weapon = assets.image(path)
             self.weapon_graphics.append(weapon)
 
         self.magic_graphics = []
         for magic in magic_data.values():
-            magic = pygame.image.load(magic['graphic']).convert_alpha()
+            magic = assets.image(magic['graphic'])
             self.magic_graphics.append(magic)
 
+        # Области экрана, изменившиеся в последнем кадре (для режима грязных прямоугольников)
+        self.last_state = None
+        self.dirty_rects = []
+
+    @staticmethod
+    def asset_paths():
+        """
+        Возвращает пути к изображениям оружия и магических способностей интерфейса.
+
+        Returns:
+            list: Пути к файлам изображений (для фоновой предзагрузки).
+        """
+        return [item['graphic'] for item in list(weapon_data.values()) + list(magic_data.values())]
+
     def show_bar(self, current, max_amount, bg_rect, color):
         """
        Отображает полосу состояния на интерфейсе.
@@ -133,12 +151,16 @@ class UI:
 
         Метод отображает изображение оружия на интерфейсе в указанной позиции.
         Если оружие выбрано, его изображение отличается от обычного.
+
+        Returns:
+            pygame.Rect: Область экрана, занятая элементом.
         """
         bg_rect = self.selection_box(30, 630, has_switched)  # оружие
         weapon_surf = self.weapon_graphics[weapon_index]
         weapon_rect = weapon_surf.get_rect(center=bg_rect.center)
 
         self.display_surface.blit(weapon_surf, weapon_rect)
+        return bg_rect.union(weapon_rect)
 
     def magic_overlay(self, magic_index, has_switched):
         """
@@ -150,6 +172,9 @@ class UI:
 
         Метод отображает изображение магической способности на интерфейсе в указанной позиции.
         Если магическая способность выбрана, ее изображение отличается от обычного.
+
+        Returns:
+            pygame.Rect: Область экрана, занятая элементом.
         """
 
         bg_rect = self.selection_box(105, 635, has_switched)  # оружие
@@ -157,6 +182,7 @@ class UI:
         magic_rect = magic_surf.get_rect(center=bg_rect.center)
 
         self.display_surface.blit(magic_surf, magic_rect)
+        return bg_rect.union(magic_rect)
 
     def display(self, player):
         """
@@ -167,9 +193,18 @@ class UI:
 
         Метод отображает все элементы интерфейса, такие как панели здоровья и энергии,
         изображения оружия и магических способностей в соответствии с текущим состоянием игрока.
+        Если отображаемые значения изменились с прошлого кадра, занятые области попадают в dirty_rects.
         """
         self.show_bar(player.Wingchest, player.stats['Крылострудие'], self.Wingchest_bar_rect, HEALTH_COLOR)
         self.show_bar(player.Aviculture, player.stats['Птичегия'], self.Aviculture_bar_rect, ENERGY_COLOR)
 
-        self.weapon_overlay(player.weapon_index, not player.can_switch_weapon)
-        self.magic_overlay(player.magic_index, not player.can_switch_magic)
\ No newline at end of file
+        weapon_rect = self.weapon_overlay(player.weapon_index, not player.can_switch_weapon)
+        magic_rect = self.magic_overlay(player.magic_index, not player.can_switch_magic)
+
+        state = (player.Wingchest, player.Aviculture, player.weapon_index, player.can_switch_weapon,
+                 player.magic_index, player.can_switch_magic)
+        if state != self.last_state:
+            self.dirty_rects = [self.Wingchest_bar_rect, self.Aviculture_bar_rect, weapon_rect, magic_rect]
+            self.last_state = state
+        else:
+            self.dirty_rects = []
\ No newline at end of file
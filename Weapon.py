@@ -1,5 +1,11 @@
 import pygame
 
+# Кадры оружия по индексу оружия: влево, вправо, вниз, вверх
+weapon_images = {
+    0: ['нож_влево.png', 'нож_вправо.png', 'нож_вниз.png', 'нож_вверх.png'],
+    1: ['топор_влево.png', 'топор_вправо.png', 'топор_вниз.png', 'топор_вверх.png']
+}
+
 
 class Weapon(pygame.sprite.Sprite):
     def __init__(self, player, groups):
@@ -13,14 +19,22 @@ class Weapon(pygame.sprite.Sprite):
         super().__init__(groups)
         self.sprite_type = 'weapon'
         self.player = player
-        self.weapon_images = {
-            0: ['нож_влево.png', 'нож_вправо.png', 'нож_вниз.png', 'нож_вверх.png'],
-            1: ['топор_влево.png', 'топор_вправо.png', 'топор_вниз.png', 'топор_вверх.png']
-        }
-        self.images = [pygame.image.load(name).convert_alpha() for name in self.weapon_images[player.weapon_index]]
+        self.weapon_images = weapon_images
+        self.images_index = player.weapon_index
+        self.images = assets.images(self.weapon_images[player.weapon_index], evictable=True)
         self.image = self.images[self.player.weapon_image_index]
         self.rect = self.image.get_rect(center=player.rect.center)
 
+    @staticmethod
+    def asset_paths():
+        """
+        Возвращает пути ко всем кадрам оружия.
+
+        Возвращает:
+        list: Пути к файлам изображений (для фоновой предзагрузки).
+        """
+        return [name for names in weapon_images.values() for name in names]
+
     def update(self):
         """
         Метод для обновления состояния оружия.
@@ -28,7 +42,9 @@ class Weapon(pygame.sprite.Sprite):
         Примечание:
         Метод обновляет изображение оружия и его позицию на основе состояния и позиции игрока.
         """
-        self.images = [pygame.image.load(name).convert_alpha() for name in self.weapon_images[self.player.weapon_index]]
+        if self.images_index != self.player.weapon_index:
+            self.images_index = self.player.weapon_index
+            self.images = assets.images(self.weapon_images[self.player.weapon_index], evictable=True)
         self.image = self.images[self.player.weapon_image_index]
 
         weapon_offsets = {
@@ -0,0 +1,162 @@
+# Настройки игры
+WIDTH = 1280
+HEIGHT = 720
+FPS = 60
+TILESIZE = 64
+
+# Размер области подгрузки (в тайлах) и радиус подгрузки вокруг игрока (в областях)
+STREAM_CHUNK_SIZE = 8
+STREAM_RADIUS = 2
+
+
+class WorldStreamer:
+    """
+    Потоковая подгрузка мира по областям вокруг игрока.
+
+    Карта делится на области STREAM_CHUNK_SIZE x STREAM_CHUNK_SIZE тайлов. Тайлы (граница, трава, объекты) и враги
+    существуют только для областей в радиусе STREAM_RADIUS от области игрока: при входе области в радиус ее ячейки
+    читаются из скомпилированной карты и создаются через create_cell, при выходе - спрайты удаляются из групп.
+
+    Срезанная трава и убитые враги запоминаются в компактном списке изменений области: множество номеров ячеек,
+    спрайты которых были уничтожены в игре (kill() до выгрузки области). Такие ячейки больше не создаются.
+    Враг появляется в своей области, но при ее выгрузке переходит в подгруженную область, где сейчас стоит его
+    хитбокс (например, когда он гонится за игроком), и выгружается вместе с ней. Пока такой враг жив, его ячейка
+    не создается заново; выгруженный живым враг при возвращении появляется заново на своем месте. Убитый враг
+    записывается в список изменений области, где он появился. Номера тайлов выгруженных областей освобождаются
+    в TileLayer и занимаются тайлами подгружаемых областей.
+
+    Attributes:
+        level_map (MapCompiler): Скомпилированные слои карты.
+        create_cell (callable): Функция создания спрайтов ячейки, возвращает список созданных спрайтов.
+        chunk_rows (int): Количество строк областей.
+        chunk_cols (int): Количество столбцов областей.
+        monster_names (dict): Номер ячейки игрока -> имя монстра, который появляется в этой ячейке.
+        loaded (dict): Ключ области -> список пар (номер ячейки, спрайт).
+        removed (dict): Ключ области -> множество номеров ячеек, уничтоженных в игре.
+        roaming (set): Номера ячеек живых врагов, перешедших из своей области в другую.
+        center (tuple): Область, вокруг которой подгружен мир.
+
+    Methods:
+        chunk_for(pos): Возвращает ключ области для мировых координат.
+        spawn_chunk(cell): Возвращает ключ области, в которой находится ячейка.
+        update(pos): Подгружает и выгружает области вокруг позиции игрока.
+        load_chunk(key): Создает спрайты области.
+        unload_chunk(key, wanted): Удаляет спрайты области и запоминает уничтоженные.
+    """
+    def __init__(self, level_map, create_cell):
+        self.level_map = level_map
+        self.create_cell = create_cell
+        self.chunk_rows = -(-level_map.rows // STREAM_CHUNK_SIZE)
+        self.chunk_cols = -(-level_map.cols // STREAM_CHUNK_SIZE)
+        self.loaded = {}
+        self.removed = {}
+        self.roaming = set()
+        self.center = None
+
+        # В ячейке игрока появляется монстр, выбранный последней ячейкой сущностей перед ней (как в create_map)
+        self.monster_names = {}
+        monster_name = None
+        for row_index, col_index, col in level_map.cells('entities'):
+            if col == 392:
+                monster_name = 'raccoon'
+            elif col == 394:
+                self.monster_names[row_index * level_map.cols + col_index] = monster_name
+            else:
+                monster_name = 'squid'
+
+    @staticmethod
+    def chunk_for(pos):
+        chunk_pixels = STREAM_CHUNK_SIZE * TILESIZE
+        return int(pos[0]) // chunk_pixels, int(pos[1]) // chunk_pixels
+
+    def spawn_chunk(self, cell):
+        row_index, col_index = divmod(cell % (self.level_map.rows * self.level_map.cols), self.level_map.cols)
+        return col_index // STREAM_CHUNK_SIZE, row_index // STREAM_CHUNK_SIZE
+
+    def update(self, pos):
+        """
+        Подгружает области в радиусе STREAM_RADIUS от позиции и выгружает остальные.
+        Пока игрок остается в одной области, ничего не делает.
+
+        Parameters:
+            pos (tuple): Мировые координаты игрока.
+        """
+        center = self.chunk_for(pos)
+        if center == self.center:
+            return
+        self.center = center
+
+        wanted = {(chunk_col, chunk_row)
+                  for chunk_col in range(center[0] - STREAM_RADIUS, center[0] + STREAM_RADIUS + 1)
+                  for chunk_row in range(center[1] - STREAM_RADIUS, center[1] + STREAM_RADIUS + 1)
+                  if 0 <= chunk_col < self.chunk_cols and 0 <= chunk_row < self.chunk_rows}
+
+        moved = []
+        for key in [key for key in self.loaded if key not in wanted]:
+            moved += self.unload_chunk(key, wanted)
+        # Области создаются в порядке строк, как при создании всей карты
+        for key in sorted(wanted - self.loaded.keys(), key=lambda key: (key[1], key[0])):
+            self.load_chunk(key)
+        for cell, sprite in moved:
+            self.loaded[self.chunk_for(sprite.hitbox.center)].append((cell, sprite))
+
+    def load_chunk(self, key):
+        """
+        Создает спрайты области: слои по порядку, ячейки построчно, пропуская уничтоженные в игре
+        и ячейки врагов, которые живы в другой области.
+
+        Parameters:
+            key (tuple): (столбец области, строка области).
+        """
+        level_map = self.level_map
+        cell_count = level_map.rows * level_map.cols
+        removed = self.removed.get(key, ())
+        sprites = []
+        rows = range(key[1] * STREAM_CHUNK_SIZE, min((key[1] + 1) * STREAM_CHUNK_SIZE, level_map.rows))
+        cols = range(key[0] * STREAM_CHUNK_SIZE, min((key[0] + 1) * STREAM_CHUNK_SIZE, level_map.cols))
+        for layer_index, (style, grid) in enumerate(level_map.grids.items()):
+            for row_index in rows:
+                for col_index in cols:
+                    index = row_index * level_map.cols + col_index
+                    col = grid[index]
+                    cell = layer_index * cell_count + index
+                    if col == -1 or cell in removed or cell in self.roaming:
+                        continue
+
+                    monster_name = None
+                    if style == 'entities':
+                        monster_name = {392: 'raccoon', 394: self.monster_names.get(index)}.get(col, 'squid')
+                    for sprite in self.create_cell(style, row_index, col_index, col, monster_name):
+                        sprites.append((cell, sprite))
+        self.loaded[key] = sprites
+
+    def unload_chunk(self, key, wanted=()):
+        """
+        Удаляет спрайты области из всех групп. Спрайты, уничтоженные в игре (срезанная трава, убитые враги),
+        записываются в список изменений области, где появились. Живые враги, хитбокс которых стоит
+        в остающейся области, не удаляются. Номера выгруженных тайлов возвращаются в свои слои (TileLayer.release),
+        поэтому память слоев не растет с каждой посещенной областью.
+
+        Parameters:
+            key (tuple): (столбец области, строка области).
+            wanted (set): Области, которые остаются подгруженными.
+
+        Returns:
+            list: Пары (номер ячейки, враг), которые нужно передать области, где стоит враг.
+        """
+        moved = []
+        for cell, sprite in self.loaded.pop(key):
+            if not sprite.alive():
+                self.removed.setdefault(self.spawn_chunk(cell), set()).add(cell)
+                self.roaming.discard(cell)
+            elif isinstance(sprite, Enemy) and self.chunk_for(sprite.hitbox.center) in wanted:
+                self.roaming.add(cell)
+                moved.append((cell, sprite))
+                continue
+            else:
+                sprite.kill()
+                self.roaming.discard(cell)
+            # На выгруженный тайл больше никто не ссылается: его номер занимают тайлы новых областей
+            if isinstance(sprite, Tile):
+                sprite.layer.release(sprite.index)
+        return moved
@@ -21,15 +21,6 @@ FPS = 60
 TILESIZE = 64
 
 
-def debug(info, x=10, y=10):
-    display_surface = pygame.display.get_surface()
-    font = pygame.font.Font(None, 30)
-    debug_surf = font.render(str(info), True, 'White')
-    debug_rect = debug_surf.get_rect(topleft=(x, y))
-    pygame.draw.rect(display_surface, 'Black', debug_rect)
-    display_surface.blit(debug_surf, debug_rect)
-
-
 if __name__ == '__main__':
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -217,6 +208,9 @@ if __name__ == '__main__':
 
     font = pygame.font.SysFont(None, 24)
 
+    # Изображения игры декодируются в фоне, пока показываются вступительные экраны
+    Game.preload_assets()
+
     for text in texts:
         text_lines = text.split('\n')
         text_surfaces = [font.render(line, True, (255, 255, 255)) for line in text_lines]
@@ -245,7 +239,11 @@ if __name__ == '__main__':
                 y += text_surface.get_height()
 
             pygame.display.flip()
+            assets.pump(limit=16)
             clock.tick(FPS)
 
-    game = Game()
+    # python main.py --record файл записывает ввод сессии, --replay файл воспроизводит его
+    record_path = sys.argv[sys.argv.index('--record') + 1] if '--record' in sys.argv else None
+    replay_path = sys.argv[sys.argv.index('--replay') + 1] if '--replay' in sys.argv else None
+    game = Game(record_path=record_path, replay_path=replay_path)
     game.run()